@@ -8,6 +8,8 @@ from prettytable import PrettyTable
 from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
 import os
+import json
+from llm_client import build_batch_prompt, parse_batch_response
 
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -177,6 +179,49 @@ String 2: {string2}
         return f"LLM call failed: {str(e)}"
 
 
+def call_llm_groq_batch(texts, batch_size=10, max_retries=2):
+    """Extract fields for many descriptions with one chat completion per `batch_size` texts.
+
+    Returns one dict per text, or None where the LLM never gave a parseable answer.
+    Only the descriptions that failed to parse are sent again on retry.
+    """
+    results = [None] * len(texts)
+    pending = list(range(len(texts)))
+
+    for attempt in range(max_retries + 1):
+        failed = []
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            prompt = build_batch_prompt([texts[i] for i in chunk])
+            try:
+                response = requests.post(
+                    "https://api.groq.com/openai/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
+                    json={
+                        "model": "llama3-70b-8192",
+                        "messages": [{"role": "user", "content": prompt}],
+                        "temperature": 0.2
+                    }
+                )
+                content = response.json()["choices"][0]["message"]["content"]
+                parsed = parse_batch_response(content, len(chunk))
+            except Exception as e:
+                print(f"❌ LLM batch call failed: {e}")
+                parsed = {}
+
+            for position, index in enumerate(chunk):
+                if position in parsed:
+                    results[index] = parsed[position]
+                else:
+                    failed.append(index)
+
+        if not failed:
+            break
+        pending = failed
+
+    return results
+
+
 # === Step 7: Check if Fields Are Missing ===
 def fields_missing(results):
     for aspect, val1, val2, _ in results:
@@ -214,6 +259,37 @@ def compare_strings(string1, string2):
         print("\n LLM Fallback Output:")
         print(llm_output)
 
+def compare_strings_batch(pairs):
+    """Compare many pairs; pairs with missing fields share batched LLM calls"""
+    needs_llm = []
+    for string1, string2 in pairs:
+        s1 = preprocess(string1)
+        s2 = preprocess(string2)
+
+        results = []
+        for aspect, func in [
+            ("Grade", extract_grade),
+            ("Diameter", extract_diameter),
+            ("Material", extract_material),
+            ("Form", extract_form),
+            ("Length", extract_length),
+            ("Standard", extract_standard),
+        ]:
+            status, v1, v2 = compare_field(func(s1), func(s2))
+            results.append((aspect, v1 or "-", v2 or "-", status))
+
+        print_report(string1, string2, results)
+        if fields_missing(results):
+            needs_llm.append((string1, string2))
+
+    if needs_llm:
+        print(f"\n Falling back to Groq LLM for {len(needs_llm)} pairs...\n")
+        texts = [text for pair in needs_llm for text in pair]
+        extracted = call_llm_groq_batch(texts)
+        for i, (string1, string2) in enumerate(needs_llm):
+            print(f"\n LLM Fallback Output:\nString 1: {string1}\nString 2: {string2}")
+            print(json.dumps({"String 1": extracted[2 * i], "String 2": extracted[2 * i + 1]}, indent=2))
+
 # === Step 9: CLI Input ===
 if __name__ == "__main__":
     print("\n🔧 Product Comparator - Enter two descriptions\n")
@@ -0,0 +1,207 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from metrics import LATENCY_BUCKETS_MS, Histogram
+
+# ---
+# MICRO-BATCH SCHEDULER
+# Collects items submitted from many threads for up to `max_latency_ms` or
+# `max_batch_size` items, runs them through one batched call and resolves
+# every caller's future with its own slice of the results
+# ---
+
+
+class SchedulerFull(Exception):
+    """The scheduler's queue is at `max_queue`; the caller should back off"""
+
+
+class SchedulerClosed(RuntimeError):
+    """The scheduler was closed before it could take or process this request"""
+
+
+class MicroBatchScheduler:
+    """Dynamic micro-batching in front of a batch function
+
+    `process_fn(items)` must return one result per item, in order. Items are
+    queued in groups (one group per `submit`/`submit_many` call) so a caller's
+    items always land in the same batch; a single group larger than
+    `max_batch_size` is processed on its own.
+    """
+
+    def __init__(self, process_fn: Callable[[List], Sequence], max_batch_size: int = 32,
+                 max_latency_ms: float = 5, max_queue: int = 1024, name: str = "micro-batch"):
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.name = name
+        self._queue: "queue.Queue[Tuple[List, Future, float]]" = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        # Held while checking `_closed` and enqueueing, so nothing is queued after close()
+        self._submit_lock = threading.Lock()
+        self._carry = None
+
+        # Metrics
+        self.queue_depth = Histogram()
+        self.batch_size = Histogram()
+        self.wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.process_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit_many(self, items: List) -> Future:
+        """Queue a group of items; the future resolves to their results as a list"""
+        future = Future()
+        items = list(items)
+        with self._submit_lock:
+            if self._closed.is_set():
+                raise SchedulerClosed(f"{self.name} scheduler is closed")
+            if not items:
+                future.set_result([])
+                return future
+            self.queue_depth.observe(self._queue.qsize())
+            try:
+                self._queue.put_nowait((items, future, time.perf_counter()))
+            except queue.Full:
+                self.rejected += 1
+                raise SchedulerFull(f"{self.name} queue is full ({self._queue.maxsize})")
+        return future
+
+    def submit(self, item) -> Future:
+        """Queue one item; the future resolves to its result"""
+        future = Future()
+        group = self.submit_many([item])
+
+        def unwrap(done: Future):
+            error = done.exception()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[0])
+        group.add_done_callback(unwrap)
+        return future
+
+    def __call__(self, item):
+        """Blocking convenience: submit one item and wait for its result"""
+        return self.submit(item).result()
+
+    def map(self, items: List) -> List:
+        """Blocking convenience: submit a group and wait for its results"""
+        return self.submit_many(items).result()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _next_group(self, timeout: float):
+        if self._carry is not None:
+            group, self._carry = self._carry, None
+            return group
+        return self._queue.get(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[List, Future, float]]:
+        """Block for the first group, then gather more until the batch is full or the latency budget is spent"""
+        while True:
+            try:
+                first = self._next_group(timeout=0.1)
+                break
+            except queue.Empty:
+                if self._closed.is_set():
+                    # Nothing is queued once closed is set, so an empty queue now is final
+                    try:
+                        first = self._queue.get_nowait()
+                        break
+                    except queue.Empty:
+                        return []
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_latency
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                group = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(group[0]) > self.max_batch_size:
+                # Does not fit: it opens the next batch instead
+                self._carry = group
+                break
+            batch.append(group)
+            size += len(group[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            self._process(batch)
+
+    def _process(self, batch: List[Tuple[List, Future, float]]):
+        started = time.perf_counter()
+        items = [item for group, _, _ in batch for item in group]
+        for _, _, queued_at in batch:
+            self.wait_ms.observe((started - queued_at) * 1000)
+        self.batch_size.observe(len(items))
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = list(self.process_fn(items))
+            if len(results) != len(items):
+                raise ValueError(f"{self.name}: process_fn returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            self.errors += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finally:
+            self.process_ms.observe((time.perf_counter() - started) * 1000)
+        offset = 0
+        for group, future, _ in batch:
+            future.set_result(results[offset:offset + len(group)])
+            offset += len(group)
+
+    def stats(self) -> Dict:
+        """Counters plus queue-depth, batch-size, wait and processing-time histograms"""
+        return {
+            "pending": self.pending(),
+            "batches": self.batches,
+            "items": self.items,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "queue_depth": self.queue_depth.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+            "wait_ms": self.wait_ms.snapshot(),
+            "process_ms": self.process_ms.snapshot(),
+        }
+
+    def close(self, wait: bool = True):
+        """Stop accepting work; queued groups are still processed
+
+        With `wait`, returns once the worker has drained the queue; any group
+        it could not process (the worker died) fails with SchedulerClosed.
+        """
+        with self._submit_lock:
+            self._closed.set()
+        if wait:
+            self._thread.join()
+            self._fail_pending(SchedulerClosed(f"{self.name} scheduler closed before processing this request"))
+
+    def _fail_pending(self, error: Exception):
+        groups = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while True:
+            try:
+                groups.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for _, future, _ in groups:
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,69 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# ---
+# STARTUP BENCHMARK
+# Times each cold-start stage of EnhancedProductComparator in a fresh
+# interpreter: import, construction, a regex-only extraction, an exact-match
+# comparison, then the first NER and the first semantic call (which load the models)
+# ---
+
+STAGES = r"""
+import json, time
+t0 = time.perf_counter()
+timings = {}
+
+def mark(stage):
+    global t0
+    now = time.perf_counter()
+    timings[stage] = now - t0
+    t0 = now
+
+import product_comparator_enhanced as pce
+mark("import")
+comparator = pce.EnhancedProductComparator(warmup=WARMUP)
+mark("construct")
+comparator.extract_with_regex("TMT Fe500D 12mm 12000mm IS 1786 Loose")
+mark("regex_extract")
+comparator.compare_field("IS 1786", "IS 1786")
+comparator.compare_field("Fe500D", "Fe 500D")
+mark("exact_fuzzy_compare")
+models_after_cheap_work = comparator.models_loaded()
+comparator.extract_with_ner("TMT Fe500D 12mm 12000mm IS 1786 Loose")
+mark("first_ner")
+comparator.semantic_similarity("Loose", "Bulk")
+mark("first_semantic")
+print(json.dumps({"timings": timings, "models_after_cheap_work": models_after_cheap_work}))
+"""
+
+
+def run_once(warmup: bool) -> dict:
+    """Run the stages in a new interpreter so nothing is already imported"""
+    code = STAGES.replace("WARMUP", repr(warmup))
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure comparator cold-start time per stage")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per mode")
+    args = parser.parse_args()
+
+    for warmup in (False, True):
+        runs = [run_once(warmup) for _ in range(args.runs)]
+        stages = runs[0]["timings"].keys()
+        print(f"\n⏱️  warmup={warmup} (median of {args.runs} runs)")
+        total = 0.0
+        for stage in stages:
+            median = sorted(run["timings"][stage] for run in runs)[len(runs) // 2]
+            total += median
+            print(f"  {stage:<22} {median * 1000:10.1f} ms   (cumulative {total * 1000:10.1f} ms)")
+        print(f"  models loaded before NER/semantic: {runs[0]['models_after_cheap_work']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from units import parse_length
+
+# ---
+# BLOCKING
+# Candidate generation for catalog matching and dedup. Records are grouped by
+# their normalized Material/Grade/Standard values, and inside each block a
+# sorted-neighborhood window over the Diameter (in mm) picks the pairs worth a
+# full comparison. A field present on only one side is already a mismatch in
+# compare_field, so an empty key part only meets other empty key parts.
+# ---
+
+BLOCK_FIELDS = ("Material", "Grade", "Standard")
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def field_value(entities: Dict[str, str], field: str) -> str:
+    """Value of `field` from merged entities, whichever casing the extractor used"""
+    return entities.get(field) or entities.get(field.lower()) or entities.get(field.upper()) or ""
+
+
+def normalize_key(value: str) -> str:
+    """Casefold and drop separators: "Fe 500D", "FE-500D" and "fe500d" share a block"""
+    return _NON_ALNUM.sub("", value.lower())
+
+
+def block_key(entities: Dict[str, str], fields: Sequence[str] = BLOCK_FIELDS, canonicalizer=None) -> Tuple[str, ...]:
+    """Normalized key values; with a canonical.Canonicalizer, aliases ("TMT Bars", "Thermo
+    Mechanically Treated") are replaced by their canonical form first and share a block
+    """
+    key = []
+    for field in fields:
+        value = field_value(entities, field)
+        if canonicalizer is not None:
+            value = canonicalizer.canonicalize(field, value) or value
+        key.append(normalize_key(value))
+    return tuple(key)
+
+
+def diameter_value(entities: Dict[str, str]) -> Optional[float]:
+    """Diameter in millimetres, so "12 mm" and "1.2 cm" sort together; None if there is no number
+
+    Values units.parse_length cannot read ("12 MM DIA") fall back to their first number, taken as mm.
+    """
+    value = field_value(entities, "Diameter")
+    mm = parse_length(value)
+    if mm is not None:
+        return mm
+    match = _NUMBER.search(value)
+    return float(match.group()) if match else None
+
+
+class Blocker:
+    """Key blocking on `key_fields` plus sorted-neighborhood blocking on Diameter
+
+    Within a block, records are sorted by diameter and only records at most
+    `window - 1` positions apart become candidates. Blocks no larger than
+    `window` are compared all-vs-all.
+    """
+
+    def __init__(self, key_fields: Sequence[str] = BLOCK_FIELDS, window: int = 8, canonicalizer=None):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.key_fields = tuple(key_fields)
+        self.window = window
+        self.canonicalizer = canonicalizer
+
+    def blocks(self, records: Sequence[Dict[str, str]]) -> Dict[Tuple[str, ...], List[int]]:
+        """Record indices grouped by block key"""
+        blocks: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for i, entities in enumerate(records):
+            blocks[block_key(entities, self.key_fields, self.canonicalizer)].append(i)
+        return dict(blocks)
+
+    def _neighborhoods(self, members: List[int], records: Sequence[Dict[str, str]]) -> List[List[int]]:
+        """Sliding windows over a block sorted by diameter (records without one sorted apart)"""
+        if len(members) <= self.window:
+            return [members] if len(members) > 1 else []
+        with_diameter, without = [], []
+        for i in members:
+            diameter = diameter_value(records[i])
+            (with_diameter if diameter is not None else without).append((diameter, i))
+        groups = []
+        for ordered in (sorted(with_diameter), sorted(without, key=lambda item: item[1])):
+            order = [i for _, i in ordered]
+            if len(order) <= self.window:
+                if len(order) > 1:
+                    groups.append(order)
+                continue
+            groups.extend(order[start:start + self.window] for start in range(len(order) - self.window + 1))
+        return groups
+
+    def candidate_groups(self, records: Sequence[Dict[str, str]]) -> List[List[int]]:
+        """Groups whose internal pairs are the candidates (the `candidates` argument of the deduplicator)"""
+        groups = []
+        for members in self.blocks(records).values():
+            groups.extend(self._neighborhoods(members, records))
+        return groups
+
+    def candidate_pairs(self, records: Sequence[Dict[str, str]]) -> List[Tuple[int, int]]:
+        """Distinct (i, j) candidate pairs within one catalog, i < j"""
+        pairs = set()
+        for group in self.candidate_groups(records):
+            for a in range(len(group)):
+                for b in range(a + 1, len(group)):
+                    i, j = group[a], group[b]
+                    pairs.add((i, j) if i < j else (j, i))
+        return sorted(pairs)
+
+    def pairs_between(self, left: Sequence[Dict[str, str]],
+                      right: Sequence[Dict[str, str]]) -> Iterator[Tuple[int, int]]:
+        """Candidate (left index, right index) pairs between two catalogs"""
+        combined = list(left) + list(right)
+        n_left = len(left)
+        seen = set()
+        for group in self.candidate_groups(combined):
+            lefts = [i for i in group if i < n_left]
+            rights = [i - n_left for i in group if i >= n_left]
+            for i in lefts:
+                for j in rights:
+                    if (i, j) not in seen:
+                        seen.add((i, j))
+                        yield i, j
+
+    def stats(self, records: Sequence[Dict[str, str]]) -> Dict:
+        """How many comparisons blocking saves on one catalog"""
+        n = len(records)
+        all_pairs = n * (n - 1) // 2
+        candidates = len(self.candidate_pairs(records))
+        blocks = self.blocks(records)
+        return {
+            "records": n,
+            "blocks": len(blocks),
+            "largest_block": max((len(members) for members in blocks.values()), default=0),
+            "all_pairs": all_pairs,
+            "candidate_pairs": candidates,
+            "reduction": all_pairs / candidates if candidates else None,
+        }
+
+
+def match_catalogs(comparator, left_texts: List[str], right_texts: List[str],
+                   blocker: Optional[Blocker] = None, batch_size: int = 32) -> List[Dict]:
+    """Compare only the blocked candidate pairs between two catalogs
+
+    Every text is extracted once; reports carry `left_index`/`right_index`.
+    """
+    blocker = blocker or Blocker(canonicalizer=comparator.canonicalizer)
+    entities = comparator.extract_many(list(left_texts) + list(right_texts), batch_size=batch_size)
+    left = [entities[text] for text in left_texts]
+    right = [entities[text] for text in right_texts]
+    index_pairs = list(blocker.pairs_between(left, right))
+    reports = comparator.compare_extracted(
+        [(left_texts[i], right_texts[j]) for i, j in index_pairs], entities, batch_size=batch_size
+    )
+    for (i, j), report in zip(index_pairs, reports):
+        report["left_index"] = i
+        report["right_index"] = j
+    return reports
@@ -0,0 +1,202 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ---
+# CANONICALIZATION
+# Alias tables for Material, Grade, Form and Standard values. An exact lookup
+# goes through a hash map keyed on the compact form (uppercased, separators
+# removed, so "FE 500D", "Fe_500D" and "fe-500d" share one key); values with
+# trailing extras ("TMT Bars 12mm", "IS 1786:2008") fall back to a
+# longest-prefix match in a character trie that only accepts matches ending
+# on a token boundary, so "FE500" never swallows "FE500D".
+# ---
+
+CANONICAL_FIELDS = ("Material", "Grade", "Form", "Standard")
+
+# Seeded from DataAugmenter.synonyms / .typos (data_augmentation.py) plus the
+# spellings seen in the product-comparator sample pairs
+MATERIAL_ALIASES = {
+    "TMT": ["TMT", "TMTT", "Thermo Mechanically Treated", "Thermo-Mechanically Treated",
+            "TMT Bar", "TMT Bars", "TMT Rebar"],
+    "OPC": ["OPC", "OPCC", "OPC Cement", "Ordinary Portland Cement", "Portland Cement"],
+    "PC STRAND": ["PC Strand", "Pre-stressed Concrete Strand", "Prestressed Concrete Strand",
+                  "LRPC Strand", "LRPCF", "Strand"],
+    "HT STRAND": ["HT Strand", "HT Steel Strand", "High Tensile Strand", "High Tensile Steel Strand"],
+    "REBAR": ["Rebar", "Rib Bar", "Reinforcement Bar", "Reinforcement Steel Bar"],
+    "CEMENT": ["Cement"],
+    "STEEL": ["Steel"],
+}
+
+GRADE_ALIASES = {
+    **{
+        f"Fe{number}{suffix}": [f"Fe{number}{suffix}", f"Fe {number}{suffix}", f"Fe{number} {suffix}".strip()]
+        for number in (415, 500, 550, 600) for suffix in ("", "D", "S")
+    },
+    **{
+        str(grade): [f"OPC {grade}", f"{grade} Grade", f"Grade {grade}", f"OPC {grade} Grade", str(grade)]
+        for grade in (33, 43, 53)
+    },
+    "Class I": ["Class I", "Class 1"],
+    "Class II": ["Class II", "Class 2"],
+    "1860": ["1860", "Grade 1860", "1860 MPa"],
+}
+
+# Bulk cement is sold loose and packed cement in bags (main.py and vocabulary.json agree)
+FORM_ALIASES = {
+    "Loose": ["Loose", "LooseLoose", "Bulk"],
+    "Bag": ["Bag", "Bags", "Packed"],
+    "Coil": ["Coil", "Coils"],
+    "Bundle": ["Bundle", "Bundles"],
+    "Straight bars": ["Straight bars", "Straight bar", "Straight"],
+}
+
+STANDARD_NUMBERS = (269, 456, 1786, 2062, 6003, 8112, 12269, 14268)
+STANDARD_PREFIXES = ("IS", "I.S.", "BIS", "Indian Standard")
+STANDARD_ALIASES = {
+    f"IS {number}": [f"{prefix} {number}" for prefix in STANDARD_PREFIXES] for number in STANDARD_NUMBERS
+}
+
+FIELD_ALIASES = {
+    "Material": MATERIAL_ALIASES,
+    "Grade": GRADE_ALIASES,
+    "Form": FORM_ALIASES,
+    "Standard": STANDARD_ALIASES,
+}
+
+# Trailing tokens that never change what a value means for that field
+IGNORED_TOKENS = {
+    "Material": {"BAR", "BARS", "ROD", "RODS"},
+    "Grade": {"GRADE"},
+    "Standard": {"PART", "YEAR"},
+}
+
+_SEPARATORS = re.compile(r"[\s_\-./:,;()#]+")
+_YEAR = re.compile(r"^(19|20)\d\d$")
+
+
+def tokens(value: str) -> List[str]:
+    """Uppercased tokens with separators (space, _, -, ., /, :, ...) removed"""
+    return [token for token in _SEPARATORS.split(str(value).upper()) if token]
+
+
+def compact(value: str) -> str:
+    """Hash-map key: the tokens run together"""
+    return "".join(tokens(value))
+
+
+class _TrieNode:
+    __slots__ = ("children", "canonical")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.canonical: Optional[str] = None
+
+
+class FieldCanonicalizer:
+    """Alias table for one field: hash map for whole values, trie for prefixes"""
+
+    def __init__(self, field: str, ignored_tokens: Iterable[str] = ()):
+        self.field = field
+        self.ignored_tokens = set(ignored_tokens)
+        self.exact: Dict[str, str] = {}
+        self.canonicals = set()
+        self.root = _TrieNode()
+
+    def add(self, canonical: str, aliases: Iterable[str]):
+        self.canonicals.add(canonical)
+        for alias in list(aliases) + [canonical]:
+            key = compact(alias)
+            if not key:
+                continue
+            self.exact[key] = canonical
+            node = self.root
+            for char in key:
+                node = node.children.setdefault(char, _TrieNode())
+            node.canonical = canonical
+
+    def longest_prefix(self, value_tokens: List[str]) -> Tuple[Optional[str], int]:
+        """(canonical, tokens consumed) of the longest alias ending on a token boundary"""
+        best, consumed = None, 0
+        node = self.root
+        for count, token in enumerate(value_tokens, 1):
+            for char in token:
+                node = node.children.get(char)
+                if node is None:
+                    return best, consumed
+            if node.canonical is not None:
+                best, consumed = node.canonical, count
+        return best, consumed
+
+    def canonicalize(self, value: str) -> Optional[str]:
+        """Canonical form of `value`, or None when no alias covers it"""
+        value_tokens = tokens(value)
+        if not value_tokens:
+            return None
+        canonical = self.exact.get("".join(value_tokens))
+        if canonical is not None:
+            return canonical
+        canonical, consumed = self.longest_prefix(value_tokens)
+        if canonical is None:
+            return None
+        rest = [token for token in value_tokens[consumed:] if token not in self.ignored_tokens]
+        if self.field == "Standard":
+            # Edition years ("IS 1786:2008") do not change the standard
+            rest = [token for token in rest if not _YEAR.match(token)]
+        if not rest:
+            return canonical
+        # Extra information after the alias: keep it, with the alias part normalized
+        return " ".join([canonical] + rest)
+
+
+class Canonicalizer:
+    """Per-field alias tables used by compare_field before fuzzy/semantic matching"""
+
+    def __init__(self, field_aliases: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 ignored_tokens: Optional[Dict[str, Iterable[str]]] = None):
+        field_aliases = FIELD_ALIASES if field_aliases is None else field_aliases
+        ignored_tokens = IGNORED_TOKENS if ignored_tokens is None else ignored_tokens
+        self.fields: Dict[str, FieldCanonicalizer] = {}
+        for field, aliases in field_aliases.items():
+            table = FieldCanonicalizer(field, ignored_tokens.get(field, ()))
+            for canonical, variants in aliases.items():
+                table.add(canonical, variants)
+            self.fields[field.lower()] = table
+        self._memo: Dict[Tuple[str, str], Optional[str]] = {}
+        self.max_memo = 100_000
+
+    def add_synonyms(self, field: str, synonyms: Dict[str, List[str]]):
+        """Extend a field's table, e.g. with `DataAugmenter().synonyms`"""
+        table = self.fields.setdefault(field.lower(), FieldCanonicalizer(field))
+        for canonical, variants in synonyms.items():
+            table.add(canonical, variants)
+        self._memo.clear()
+
+    def handles(self, field: Optional[str]) -> bool:
+        return bool(field) and field.lower() in self.fields
+
+    def canonicalize(self, field: Optional[str], value: str) -> Optional[str]:
+        """Canonical value for `field`, or None if the field or value is unknown"""
+        if not field or not value:
+            return None
+        key = (field.lower(), value)
+        if key not in self._memo:
+            if len(self._memo) >= self.max_memo:
+                self._memo.clear()
+            table = self.fields.get(key[0])
+            self._memo[key] = table.canonicalize(value) if table is not None else None
+        return self._memo[key]
+
+    def compare(self, field: Optional[str], val1: str, val2: str) -> Optional[bool]:
+        """True if both values share a canonical form, False if both are distinct known
+        entries (e.g. Fe500 vs Fe500D), None when the tables cannot decide
+        """
+        canonical1 = self.canonicalize(field, val1)
+        canonical2 = self.canonicalize(field, val2)
+        if canonical1 is None or canonical2 is None:
+            return None
+        if canonical1 == canonical2:
+            return True
+        known = self.fields[field.lower()].canonicals
+        if canonical1 in known and canonical2 in known:
+            return False
+        return None
@@ -0,0 +1,392 @@
+import json
+import os
+from typing import Dict, Iterable, List, Set, Tuple
+
+import faiss
+import numpy as np
+
+from catalog_profile import description_hash
+
+# ---
+# CATALOG INDEX
+# FAISS index over catalog descriptions and their field values, so an
+# incoming description only goes through compare_products against its
+# top-k nearest catalog rows instead of the whole catalog. Rows are kept up
+# to date incrementally: a content hash per row decides what to re-extract
+# and re-embed, replaced or deleted rows are tombstoned and filtered out of
+# searches, and the index is compacted once tombstones pile up.
+# ---
+
+INDEX_TYPES = ("auto", "flat", "ivf", "hnsw")
+
+
+class CatalogIndex:
+    """Nearest-product lookup over a catalog of (id, description) rows"""
+
+    def __init__(self, comparator, index_type: str = "auto", ivf_threshold: int = 50_000,
+                 nprobe: int = 16, hnsw_m: int = 32, compact_ratio: float = 0.2):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {INDEX_TYPES}, got {index_type!r}")
+        self.comparator = comparator
+        self.index_type = index_type
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        # Compact once this share of the stored rows are tombstones
+        self.compact_ratio = compact_ratio
+
+        self.index = None
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.hashes: List[str] = []
+        self.entities: List[Dict[str, str]] = []
+        self.field_vectors: Dict[str, np.ndarray] = {}
+        # Whether rows carry extracted entities (build(..., with_fields=True))
+        self.with_fields = False
+        # Stored rows that were replaced or deleted, and the live row of every id
+        self.deleted: Set[int] = set()
+        self.rows_by_id: Dict[str, int] = {}
+
+    # --- Building ---
+
+    @staticmethod
+    def _unique_ids(ids) -> List[str]:
+        ids = [str(i) for i in ids]
+        if len(set(ids)) != len(ids):
+            raise ValueError("catalog ids must be unique")
+        return ids
+
+    def embed_texts(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Embed whole descriptions as L2-normalized float32 rows (inner product == cosine)"""
+        vectors = self.comparator.semantic_model.encode(list(texts), batch_size=batch_size)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _make_index(self, n_rows: int, dim: int):
+        """Pick the FAISS index for the catalog size: exact flat search, then IVF or HNSW"""
+        index_type = self.index_type
+        if index_type == "auto":
+            index_type = "flat" if n_rows < self.ivf_threshold else "ivf"
+        self.resolved_type = index_type
+
+        if index_type == "flat":
+            return faiss.IndexFlatIP(dim)
+        if index_type == "hnsw":
+            return faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+
+        # IVF needs enough rows per list to train its coarse quantizer
+        nlist = max(1, min(int(4 * np.sqrt(n_rows)), n_rows // 39))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = min(self.nprobe, nlist)
+        return index
+
+    def build(self, ids: List[str], texts: List[str], batch_size: int = 64, with_fields: bool = True):
+        """Embed the catalog and build the index
+
+        With `with_fields`, every row is also run through the comparator's
+        extraction and each field value is embedded, so candidates can be
+        re-ranked field by field and reused by compare_products.
+        """
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        self.ids = self._unique_ids(ids)
+        self.texts = list(texts)
+        self.hashes = [description_hash(text) for text in self.texts]
+        self.deleted = set()
+        self.rows_by_id = {catalog_id: row for row, catalog_id in enumerate(self.ids)}
+
+        reporter = self.comparator.reporter
+        reporter.info(f"📦 Embedding {len(self.texts)} catalog descriptions...")
+        vectors = self.embed_texts(self.texts, batch_size=batch_size)
+        self.index = self._make_index(len(self.texts), vectors.shape[1])
+        if not self.index.is_trained:
+            self.index.train(vectors)
+        self.index.add(vectors)
+
+        self.entities = []
+        self.field_vectors = {}
+        self.with_fields = with_fields
+        if with_fields:
+            self._build_field_vectors(batch_size)
+        reporter.info(f"✅ Built {self.resolved_type} index with {self.index.ntotal} rows")
+        return self
+
+    def _build_field_vectors(self, batch_size: int):
+        """Extract fields for every row and store one normalized vector per (field, row)"""
+        self.entities, self.field_vectors = self._field_rows(self.texts, batch_size)
+
+    def _field_rows(self, texts: List[str], batch_size: int) -> Tuple[List[Dict[str, str]], Dict[str, np.ndarray]]:
+        """Entities of `texts` and their per-field normalized value vectors (one row per text)"""
+        extracted = self.comparator.extract_many(texts, batch_size=batch_size)
+        entities = [extracted[text] for text in texts]
+
+        values = [value for row in entities for value in row.values()]
+        embeddings = self.comparator.encode_values(values, batch_size=batch_size)
+        if not embeddings:
+            return entities, {}
+        dim = len(next(iter(embeddings.values())))
+
+        field_vectors = {}
+        fields = sorted({field for row in entities for field in row})
+        for field in fields:
+            matrix = np.zeros((len(texts), dim), dtype=np.float32)
+            for number, row in enumerate(entities):
+                value = row.get(field)
+                if value:
+                    matrix[number] = np.asarray(embeddings[value], dtype=np.float32)
+            # Rows without the field stay all-zero and score 0 against any query
+            faiss.normalize_L2(matrix)
+            field_vectors[field] = matrix
+        return entities, field_vectors
+
+    # --- Incremental updates ---
+
+    def live_rows(self) -> int:
+        return len(self.ids) - len(self.deleted)
+
+    def _append_rows(self, ids: List[str], texts: List[str], batch_size: int):
+        """Embed, extract and append new rows; existing rows are untouched"""
+        vectors = self.embed_texts(texts, batch_size=batch_size)
+        if self.index is None:
+            self.index = self._make_index(len(texts), vectors.shape[1])
+            if not self.index.is_trained:
+                self.index.train(vectors)
+        self.index.add(vectors)
+
+        start = len(self.ids)
+        self.ids.extend(ids)
+        self.texts.extend(texts)
+        self.hashes.extend(description_hash(text) for text in texts)
+        for offset, catalog_id in enumerate(ids):
+            self.rows_by_id[catalog_id] = start + offset
+
+        if not self.with_fields:
+            return
+        entities, field_vectors = self._field_rows(texts, batch_size)
+        self.entities.extend(entities)
+        dim = next(iter(field_vectors.values())).shape[1] if field_vectors else 0
+        for field in set(self.field_vectors) | set(field_vectors):
+            old = self.field_vectors.get(field)
+            new = field_vectors.get(field)
+            if old is None:
+                old = np.zeros((start, dim), dtype=np.float32)
+            if new is None:
+                new = np.zeros((len(texts), old.shape[1]), dtype=np.float32)
+            self.field_vectors[field] = np.vstack([old, new])
+
+    def upsert(self, ids: Iterable, texts: Iterable[str], batch_size: int = 64) -> Dict[str, int]:
+        """Add new rows and replace rows whose description changed; unchanged rows cost one hash"""
+        ids, texts = self._unique_ids(ids), list(texts)
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        changed_ids, changed_texts = [], []
+        counts = {"added": 0, "changed": 0, "unchanged": 0}
+        for catalog_id, text in zip(ids, texts):
+            row = self.rows_by_id.get(catalog_id)
+            if row is not None and self.hashes[row] == description_hash(text):
+                counts["unchanged"] += 1
+                continue
+            if row is not None:
+                self.deleted.add(row)
+                counts["changed"] += 1
+            else:
+                counts["added"] += 1
+            changed_ids.append(catalog_id)
+            changed_texts.append(text)
+        if changed_ids:
+            self._append_rows(changed_ids, changed_texts, batch_size)
+        self.maybe_compact()
+        return counts
+
+    def delete(self, ids: Iterable) -> int:
+        """Tombstone rows by catalog id; returns how many were live"""
+        removed = 0
+        for catalog_id in self._unique_ids(ids):
+            row = self.rows_by_id.pop(catalog_id, None)
+            if row is not None:
+                self.deleted.add(row)
+                removed += 1
+        self.maybe_compact()
+        return removed
+
+    def sync(self, ids: List, texts: List[str], batch_size: int = 64) -> Dict[str, int]:
+        """Bring the index in line with a full catalog snapshot: upsert it, delete ids it no longer has"""
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        snapshot = set(self._unique_ids(ids))
+        counts = {"deleted": self.delete([catalog_id for catalog_id in self.rows_by_id if catalog_id not in snapshot])}
+        counts.update(self.upsert(ids, texts, batch_size=batch_size))
+        self.comparator.reporter.info(f"🔄 Catalog sync: {counts['added']} added, {counts['changed']} changed, "
+                                      f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+        return counts
+
+    def maybe_compact(self) -> bool:
+        if self.deleted and len(self.deleted) >= self.compact_ratio * len(self.ids):
+            self.compact()
+            return True
+        return False
+
+    def compact(self):
+        """Drop tombstoned rows for good, reusing the stored vectors (nothing is re-embedded)"""
+        if not self.deleted or self.index is None:
+            return
+        live = [row for row in range(len(self.ids)) if row not in self.deleted]
+        if hasattr(self.index, "make_direct_map"):
+            self.index.make_direct_map()
+        vectors = np.ascontiguousarray(
+            self.index.reconstruct_batch(np.asarray(live, dtype=np.int64)) if live
+            else np.zeros((0, self.index.d), dtype=np.float32), dtype=np.float32)
+
+        self.index = self._make_index(len(live), self.index.d)
+        if live:
+            if not self.index.is_trained:
+                self.index.train(vectors)
+            self.index.add(vectors)
+        self.ids = [self.ids[row] for row in live]
+        self.texts = [self.texts[row] for row in live]
+        self.hashes = [self.hashes[row] for row in live]
+        if self.entities:
+            self.entities = [self.entities[row] for row in live]
+        self.field_vectors = {field: np.asarray(matrix[live]) for field, matrix in self.field_vectors.items()}
+        self.rows_by_id = {catalog_id: row for row, catalog_id in enumerate(self.ids)}
+        self.deleted = set()
+        self.comparator.reporter.info(f"🧹 Compacted catalog index to {len(live)} rows")
+
+    # --- Searching ---
+
+    def _search_rows(self, texts: List[str], k: int) -> List[List[Tuple[int, float]]]:
+        """Top-k (row, cosine score) candidates for each query description"""
+        if self.index is None:
+            raise RuntimeError("Index has not been built or loaded")
+        queries = self.embed_texts(texts)
+        k = min(k, self.live_rows())
+        if k <= 0:
+            return [[] for _ in texts]
+        if self.deleted:
+            # Tombstoned rows are skipped inside the search itself
+            excluded = faiss.IDSelectorBatch(np.fromiter(self.deleted, dtype=np.int64, count=len(self.deleted)))
+            selector = faiss.IDSelectorNot(excluded)
+            if isinstance(self.index, faiss.IndexIVF):
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=self.index.nprobe)
+            elif isinstance(self.index, faiss.IndexHNSW):
+                params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.index.hnsw.efSearch)
+            else:
+                params = faiss.SearchParameters(sel=selector)
+            scores, rows = self.index.search(queries, k, params=params)
+        else:
+            scores, rows = self.index.search(queries, k)
+        return [
+            [(int(row), float(score)) for row, score in zip(row_ids, row_scores) if row >= 0]
+            for row_ids, row_scores in zip(rows, scores)
+        ]
+
+    def search_many(self, texts: List[str], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Top-k (catalog id, cosine score) candidates for each query description"""
+        return [
+            [(self.ids[row], score) for row, score in candidates]
+            for candidates in self._search_rows(texts, k)
+        ]
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (catalog id, cosine score) candidates for one description"""
+        return self.search_many([text], k)[0]
+
+    def field_scores(self, entities: Dict[str, str], rows: List[int]) -> np.ndarray:
+        """Mean per-field cosine similarity between query fields and candidate rows"""
+        fields = [field for field in entities if field in self.field_vectors and entities[field]]
+        if not fields:
+            return np.zeros(len(rows), dtype=np.float32)
+        embeddings = self.comparator.encode_values([entities[field] for field in fields])
+        total = np.zeros(len(rows), dtype=np.float32)
+        for field in fields:
+            query = np.asarray(embeddings[entities[field]], dtype=np.float32)
+            query = query / (np.linalg.norm(query) or 1.0)
+            total += self.field_vectors[field][rows] @ query
+        return total / len(fields)
+
+    def best_matches(self, text: str, k: int = 10, top: int = 1, profile=None) -> List[Dict]:
+        """Shortlist k candidates from the index, then run the full comparison on them only
+
+        Returns the `top` comparison reports ordered by overall similarity, each
+        tagged with the catalog id and the index score that shortlisted it. With a
+        `catalog_profile.CatalogProfile` of the same catalog, candidate fields and
+        embeddings come from the profile and only `text` is extracted and encoded.
+        """
+        candidates = self._search_rows([text], k)[0]
+        if profile is not None:
+            from catalog_profile import match_profile
+            reports = match_profile(self.comparator, [(text, self.ids[row]) for row, _ in candidates], profile)
+        else:
+            reports = self.comparator.compare_many([(text, self.texts[row]) for row, _ in candidates])
+        for report, (row, score) in zip(reports, candidates):
+            report["catalog_id"] = self.ids[row]
+            report["index_score"] = score
+        reports.sort(key=lambda r: r["overall_similarity"], reverse=True)
+        return reports[:top]
+
+    def rerank(self, text: str, k: int = 10, description_weight: float = 0.5) -> List[Tuple[str, float]]:
+        """Search by description, then blend in per-field similarity of the shortlisted rows"""
+        candidates = self._search_rows([text], k)[0]
+        if not self.field_vectors or not candidates:
+            return [(self.ids[row], score) for row, score in candidates]
+        rows = [row for row, _ in candidates]
+        entities = self.comparator.extract_many([text])[text]
+        fields = self.field_scores(entities, rows)
+        blended = [
+            (self.ids[row], description_weight * score + (1 - description_weight) * float(field_score))
+            for (row, score), field_score in zip(candidates, fields)
+        ]
+        blended.sort(key=lambda item: item[1], reverse=True)
+        return blended
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        """Write the FAISS index, field vectors and row metadata under `path`"""
+        if self.index is None:
+            raise RuntimeError("Index has not been built")
+        os.makedirs(path, exist_ok=True)
+        faiss.write_index(self.index, os.path.join(path, "index.faiss"))
+        fields = sorted(self.field_vectors)
+        for number, field in enumerate(fields):
+            np.save(os.path.join(path, f"field_{number}.npy"), self.field_vectors[field])
+        meta = {
+            "index_type": self.resolved_type,
+            "ids": self.ids,
+            "texts": self.texts,
+            "hashes": self.hashes,
+            "deleted": sorted(self.deleted),
+            "entities": self.entities,
+            "with_fields": self.with_fields,
+            "fields": fields,
+        }
+        with open(os.path.join(path, "catalog.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        self.comparator.reporter.info(f"💾 Catalog index saved to: {path}")
+
+    @classmethod
+    def load(cls, path: str, comparator, mmap: bool = True) -> "CatalogIndex":
+        """Load an index written by `save`; field vectors are memory-mapped by default"""
+        with open(os.path.join(path, "catalog.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        catalog = cls(comparator, index_type=meta["index_type"])
+        catalog.resolved_type = meta["index_type"]
+        catalog.index = faiss.read_index(os.path.join(path, "index.faiss"))
+        if hasattr(catalog.index, "nprobe"):
+            catalog.index.nprobe = min(catalog.nprobe, catalog.index.nlist)
+        catalog.ids = meta["ids"]
+        catalog.texts = meta["texts"]
+        catalog.hashes = meta.get("hashes") or [description_hash(text) for text in catalog.texts]
+        catalog.deleted = set(meta.get("deleted", []))
+        catalog.rows_by_id = {
+            catalog_id: row for row, catalog_id in enumerate(catalog.ids) if row not in catalog.deleted
+        }
+        catalog.entities = meta["entities"]
+        catalog.with_fields = meta.get("with_fields", bool(catalog.entities))
+        catalog.field_vectors = {
+            field: np.load(os.path.join(path, f"field_{number}.npy"), mmap_mode="r" if mmap else None)
+            for number, field in enumerate(meta["fields"])
+        }
+        return catalog
@@ -0,0 +1,282 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from reporting import Reporter
+
+# ---
+# CATALOG PROFILE
+# Pre-extracted fields and pre-encoded field-value embeddings for a fixed
+# catalog, stored as plain .npy files that are memory-mapped on load. Every
+# distinct field value is encoded once at build time; at match time only the
+# incoming descriptions are extracted and encoded. `update` refreshes a
+# profile from a newer catalog, extracting and encoding only the rows whose
+# description hash changed.
+#
+#   meta.json        model name, embedding size, field names, row/value counts
+#   ids.npy          catalog id per row
+#   id_sorted.npy    ids sorted, with id_rows.npy mapping them back to rows
+#   value_ids.npy    (rows, fields) index into values.npy, -1 where missing
+#   values.npy       distinct field values
+#   embeddings.npy   (values, dim) float32 MiniLM embedding per value
+#   hashes.npy       description hash per row (missing in older profiles)
+# ---
+
+PROFILE_FILES = ("ids", "id_sorted", "id_rows", "value_ids", "values", "embeddings")
+OPTIONAL_FILES = ("hashes",)
+
+
+def description_hash(text: str) -> str:
+    """Content hash of a catalog description; any edit to the text changes it"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CatalogProfile:
+    """Memory-mappable fields + embeddings for every catalog row"""
+
+    def __init__(self, model_name: str, fields: List[str], ids: np.ndarray, id_sorted: np.ndarray,
+                 id_rows: np.ndarray, value_ids: np.ndarray, values: np.ndarray, embeddings: np.ndarray,
+                 hashes: Optional[np.ndarray] = None):
+        self.model_name = model_name
+        self.fields = list(fields)
+        self.ids = ids
+        self.id_sorted = id_sorted
+        self.id_rows = id_rows
+        self.value_ids = value_ids
+        self.values = values
+        self.embeddings = embeddings
+        self.hashes = hashes
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --- Building ---
+
+    @classmethod
+    def build(cls, comparator, ids: Sequence, texts: Sequence[str], batch_size: int = 64) -> "CatalogProfile":
+        """Extract every row once and encode every distinct field value once"""
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        ids = [str(i) for i in ids]
+        if len(set(ids)) != len(ids):
+            raise ValueError("catalog ids must be unique")
+
+        extracted = comparator.extract_many(list(texts), batch_size=batch_size)
+        rows = [extracted[text] for text in texts]
+        hashes = [description_hash(text) for text in texts]
+        return cls._assemble(comparator, ids, hashes, rows, {}, batch_size)
+
+    @classmethod
+    def _assemble(cls, comparator, ids: List[str], hashes: List[str], rows: List[Dict[str, str]],
+                  known: Dict[str, np.ndarray], batch_size: int) -> "CatalogProfile":
+        """Lay out rows of extracted fields; values missing from `known` are encoded"""
+        fields = sorted({field for entities in rows for field in entities})
+        column = {field: number for number, field in enumerate(fields)}
+
+        values: List[str] = []
+        index: Dict[str, int] = {}
+        value_ids = np.full((len(rows), len(fields)), -1, dtype=np.int32)
+        for row, entities in enumerate(rows):
+            for field, value in entities.items():
+                if not value:
+                    continue
+                if value not in index:
+                    index[value] = len(values)
+                    values.append(value)
+                value_ids[row, column[field]] = index[value]
+
+        vectors = dict(known)
+        vectors.update(comparator.encode_values([v for v in values if v not in known], batch_size=batch_size))
+        dim = len(next(iter(vectors.values()))) if vectors else 0
+        embeddings = np.zeros((len(values), dim), dtype=np.float32)
+        for number, value in enumerate(values):
+            embeddings[number] = np.asarray(vectors[value], dtype=np.float32)
+
+        id_array = np.array(ids, dtype=str)
+        order = np.argsort(id_array, kind="stable")
+        return cls(
+            model_name=comparator.embedding_cache.model_name,
+            fields=fields,
+            ids=id_array,
+            id_sorted=id_array[order],
+            id_rows=order.astype(np.int64),
+            value_ids=value_ids,
+            values=np.array(values, dtype=str),
+            embeddings=embeddings,
+            hashes=np.array(hashes, dtype=str),
+        )
+
+    def update(self, comparator, ids: Sequence, texts: Sequence[str], batch_size: int = 64) -> "CatalogProfile":
+        """New profile for a newer catalog snapshot
+
+        Rows whose description hash is unchanged keep their fields and value
+        embeddings; only new or edited rows are extracted, and only values the
+        profile has never seen are encoded. Ids missing from the snapshot are
+        dropped. Profiles saved without hashes are rebuilt from scratch.
+        """
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length")
+        if self.hashes is None or self.model_name != comparator.embedding_cache.model_name:
+            return CatalogProfile.build(comparator, ids, texts, batch_size=batch_size)
+        ids = [str(i) for i in ids]
+        if len(set(ids)) != len(ids):
+            raise ValueError("catalog ids must be unique")
+
+        hashes = [description_hash(text) for text in texts]
+        rows: List[Optional[Dict[str, str]]] = []
+        reused = []
+        for catalog_id, digest in zip(ids, hashes):
+            try:
+                row = self.row(catalog_id)
+            except KeyError:
+                row = None
+            if row is not None and str(self.hashes[row]) == digest:
+                rows.append(self.entities(row))
+                reused.append(row)
+            else:
+                rows.append(None)
+
+        changed = [text for text, entities in zip(texts, rows) if entities is None]
+        extracted = comparator.extract_many(changed, batch_size=batch_size) if changed else {}
+        rows = [entities if entities is not None else extracted[text] for text, entities in zip(texts, rows)]
+
+        # Reuse stored embeddings for every value the profile already holds
+        position = {str(value): number for number, value in enumerate(self.values)}
+        known = {
+            value: np.asarray(self.embeddings[position[value]])
+            for entities in rows for value in entities.values() if value in position
+        }
+        comparator.reporter.info(f"🔄 Catalog profile update: {len(changed)} of {len(ids)} rows re-extracted, "
+                                 f"{len(self.ids) - len(reused)} replaced or removed")
+        return CatalogProfile._assemble(comparator, ids, hashes, rows, known, batch_size)
+
+    # --- Persistence ---
+
+    def save(self, path: str, reporter: Optional[Reporter] = None):
+        """Write the profile arrays and meta.json under `path`; logs through `reporter` (e.g. comparator.reporter)"""
+        os.makedirs(path, exist_ok=True)
+        for name in PROFILE_FILES + OPTIONAL_FILES:
+            if getattr(self, name) is not None:
+                np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        meta = {
+            "model_name": self.model_name,
+            "fields": self.fields,
+            "rows": len(self.ids),
+            "values": len(self.values),
+            "dim": int(self.embeddings.shape[1]) if self.embeddings.ndim == 2 else 0,
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        (reporter or Reporter()).info(
+            f"💾 Catalog profile saved to: {path} ({meta['rows']} rows, {meta['values']} values)"
+        )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CatalogProfile":
+        """Open a saved profile; with `mmap` nothing is read until rows are touched"""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in PROFILE_FILES
+        }
+        for name in OPTIONAL_FILES:
+            file = os.path.join(path, f"{name}.npy")
+            if os.path.exists(file):
+                arrays[name] = np.load(file, mmap_mode="r" if mmap else None)
+        return cls(model_name=meta["model_name"], fields=meta["fields"], **arrays)
+
+    # --- Lookups ---
+
+    def row(self, catalog_id) -> int:
+        """Row number of a catalog id (binary search over the sorted ids)"""
+        catalog_id = str(catalog_id)
+        position = int(np.searchsorted(self.id_sorted, catalog_id))
+        if position >= len(self.id_sorted) or self.id_sorted[position] != catalog_id:
+            raise KeyError(f"unknown catalog id {catalog_id!r}")
+        return int(self.id_rows[position])
+
+    def entities(self, row: int) -> Dict[str, str]:
+        """Extracted fields of one row, as returned by extract_many"""
+        return {
+            field: str(self.values[value_id])
+            for field, value_id in zip(self.fields, self.value_ids[row]) if value_id >= 0
+        }
+
+    def embeddings_for(self, rows: Sequence[int]) -> Dict[str, np.ndarray]:
+        """{value: embedding} for every field value of `rows`, read straight from the profile"""
+        if not len(rows):
+            return {}
+        value_ids = np.unique(np.asarray(self.value_ids[np.asarray(rows, dtype=np.int64)]))
+        value_ids = value_ids[value_ids >= 0]
+        return {str(self.values[i]): np.asarray(self.embeddings[i]) for i in value_ids}
+
+
+def match_profile(comparator, pairs: Sequence[Tuple[str, str]], profile: CatalogProfile,
+                  batch_size: int = 32) -> List[Dict]:
+    """Compare (incoming description, catalog id) pairs against a profile
+
+    Only the incoming descriptions are extracted, and only their field values
+    are encoded; catalog fields and embeddings come from the profile. Reports
+    have the usual shape, with the catalog id as `product2` and `catalog_id`.
+    """
+    if profile.model_name != comparator.embedding_cache.model_name:
+        raise ValueError(f"profile was built with {profile.model_name}, "
+                         f"comparator uses {comparator.embedding_cache.model_name}")
+    pairs = [(text, str(catalog_id)) for text, catalog_id in pairs]
+    extracted = comparator.extract_many([text for text, _ in pairs], batch_size=batch_size)
+    rows = [profile.row(catalog_id) for _, catalog_id in pairs]
+    catalog = {row: profile.entities(row) for row in set(rows)}
+    embeddings = profile.embeddings_for(list(catalog))
+
+    # Encode only what the profile does not already hold (the incoming side)
+    pending = []
+    for (text, _), row in zip(pairs, rows):
+        entities1, entities2 = extracted[text], catalog[row]
+        for field in set(entities1) | set(entities2):
+            val1, val2 = entities1.get(field, ""), entities2.get(field, "")
+            if comparator.needs_embedding(val1, val2, field):
+                pending.extend(value for value in (val1, val2) if value not in embeddings)
+    embeddings.update(comparator.encode_values(pending, batch_size=batch_size))
+
+    reports = []
+    for (text, catalog_id), row in zip(pairs, rows):
+        report = comparator.build_report(text, catalog_id, extracted[text], catalog[row], embeddings)
+        report["catalog_id"] = catalog_id
+        reports.append(report)
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a catalog profile (fields + embeddings) from a CSV catalog")
+    parser.add_argument("catalog", help="CSV file with an id and a description column")
+    parser.add_argument("output", help="directory for the profile files")
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--text-column", default="description")
+    parser.add_argument("--batch-size", type=int, default=64, help="nlp.pipe / encode batch size")
+    parser.add_argument("--model", default="ner_model_improved", help="spaCy NER model path")
+    args = parser.parse_args(argv)
+
+    from product_comparator_enhanced import EnhancedProductComparator
+
+    with open(args.catalog, newline="", encoding="utf-8") as f:
+        rows = [row for row in csv.DictReader(f) if row.get(args.text_column)]
+    comparator = EnhancedProductComparator(model_path=args.model)
+    comparator.set_output("warning")
+    profile = CatalogProfile.build(
+        comparator, [row[args.id_column] for row in rows], [row[args.text_column] for row in rows],
+        batch_size=args.batch_size,
+    )
+    profile.save(args.output, comparator.reporter)
+    print(f"✅ Profiled {len(profile.ids)} rows into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
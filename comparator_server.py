@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Long-running HTTP/JSON service around EnhancedProductComparator
+
+The spaCy and MiniLM models are loaded once and stay resident. Concurrent
+requests are queued on a MicroBatchScheduler and drained in micro-batches, so
+many small requests share one `nlp.pipe` pass and one `encode` call.
+
+    python comparator_server.py --port 8088
+
+    POST /compare        {"product1": "...", "product2": "..."}     -> report
+    POST /compare_batch  {"pairs": [["...", "..."], ...]}           -> {"reports": [...]}
+    POST /extract        {"text": "..."} or {"texts": ["...", ...]} -> {"entities": ...}
+    GET  /health                                                    -> queue/model status
+    GET  /stats                                                     -> batching and field-tier histograms
+    GET  /metrics                                                   -> stage timings, Prometheus text (--instrument)
+
+When the queue is full the server answers 503 with Retry-After instead of
+letting latency grow without bound.
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from batch_scheduler import MicroBatchScheduler, SchedulerFull
+from reporting import logs_silenced
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class ComparatorBatches:
+    """Runs queued ("compare", pair) / ("extract", text) items for a MicroBatchScheduler
+
+    All compare items in a micro-batch go through one `compare_many` and all
+    extract items through one `extract_many`; results come back in item order.
+    """
+
+    def __init__(self, comparator, batch_size: int = 32, quiet: bool = True):
+        self.comparator = comparator
+        self.batch_size = batch_size
+        self.quiet = quiet
+        if quiet:
+            # Progress lines are never formatted, instead of being redirected per batch
+            comparator.set_output("quiet")
+
+    def __call__(self, items: List[Tuple[str, object]]) -> List:
+        results = [None] * len(items)
+        compares = [i for i, (kind, _) in enumerate(items) if kind == "compare"]
+        extracts = [i for i, (kind, _) in enumerate(items) if kind == "extract"]
+        if compares:
+            reports = self.comparator.compare_many([items[i][1] for i in compares], batch_size=self.batch_size)
+            for i, report in zip(compares, reports):
+                results[i] = report
+        if extracts:
+            entities = self.comparator.extract_many([items[i][1] for i in extracts], batch_size=self.batch_size)
+            for i in extracts:
+                results[i] = entities[items[i][1]]
+        return results
+
+
+class ComparatorRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ProductComparator/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # Set by make_server
+    comparator = None
+    scheduler: MicroBatchScheduler = None
+    request_timeout: float = 30.0
+
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send(200, {
+                "status": "ok",
+                "models_loaded": self.comparator.models_loaded(),
+                "pending": self.scheduler.pending(),
+            })
+        if self.path == "/stats":
+            return self._send(200, {
+                "requests": self.scheduler.stats(),
+                "models": self.comparator.batching_stats(),
+                "field_tiers": self.comparator.cascade_stats(),
+                "embedding_cache": self.comparator.embedding_cache.stats(),
+                "stages": self.comparator.instrumentation.snapshot() if self.comparator.instrumentation else None,
+            })
+        if self.path == "/metrics":
+            if self.comparator.instrumentation is None:
+                return self._send(404, {"error": "stage instrumentation is off (start with --instrument)"})
+            return self._send_text(200, self.comparator.instrumentation.to_prometheus())
+        self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        routes = {
+            "/compare": self._compare,
+            "/compare_batch": self._compare_batch,
+            "/extract": self._extract,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            # The body is never read, so whatever follows it on this connection cannot be trusted
+            self.close_connection = True
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        try:
+            body = self._read_json()
+            status, payload = handler(body)
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except SchedulerFull:
+            return self._send(503, {"error": "queue full, retry later"}, headers={"Retry-After": "1"})
+        except FutureTimeout:
+            status, payload = 504, {"error": "timed out waiting for the comparator"}
+        except Exception as e:
+            status, payload = 500, {"error": repr(e)}
+        self._send(status, payload)
+
+    def _compare(self, body: Dict) -> Tuple[int, Dict]:
+        pair = _pair(body.get("product1"), body.get("product2"))
+        reports = self._wait(self._submit("compare", [pair]))
+        return 200, reports[0]
+
+    def _compare_batch(self, body: Dict) -> Tuple[int, Dict]:
+        pairs = body.get("pairs")
+        if not isinstance(pairs, list):
+            raise ValueError('"pairs" must be a list of [product1, product2]')
+        pairs = [_batch_pair(pair) for pair in pairs]
+        reports = self._wait(self._submit("compare", pairs)) if pairs else []
+        return 200, {"reports": reports}
+
+    def _extract(self, body: Dict) -> Tuple[int, Dict]:
+        if "texts" in body:
+            texts = body["texts"]
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError('"texts" must be a list of strings')
+            entities = self._wait(self._submit("extract", texts)) if texts else []
+            return 200, {"entities": entities}
+        text = body.get("text")
+        if not isinstance(text, str):
+            raise ValueError('expected "text" or "texts"')
+        return 200, {"entities": self._wait(self._submit("extract", [text]))[0]}
+
+    def _submit(self, kind: str, items: List) -> Future:
+        return self.scheduler.submit_many([(kind, item) for item in items])
+
+    def _wait(self, future: Future):
+        return future.result(timeout=self.request_timeout)
+
+    def _read_json(self) -> Dict:
+        header = (self.headers.get("Content-Length") or "0").strip()
+        # A negative length would make rfile.read(-1) block until the client hangs up
+        if not (header.isascii() and header.isdigit()):
+            # Without a usable length the body cannot be skipped, so the connection is closed
+            # after the 400 rather than parsing the body as the next request
+            self.close_connection = True
+            raise ValueError(f"invalid Content-Length: {header!r}")
+        length = int(header)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ValueError(f"request body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}")
+        if not isinstance(body, dict):
+            raise ValueError("request body must be a JSON object")
+        return body
+
+    def _send(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload, ensure_ascii=False, default=float).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, status: int, text: str):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+
+def _pair(text1, text2) -> Tuple[str, str]:
+    if not isinstance(text1, str) or not isinstance(text2, str):
+        raise ValueError('each pair needs string "product1" and "product2"')
+    return text1, text2
+
+
+def _batch_pair(pair) -> Tuple[str, str]:
+    """Accept either ["text1", "text2"] or {"product1": ..., "product2": ...}"""
+    if isinstance(pair, dict):
+        return _pair(pair.get("product1"), pair.get("product2"))
+    if isinstance(pair, list) and len(pair) == 2:
+        return _pair(*pair)
+    return _pair(None, None)
+
+
+def make_server(comparator, host: str = "127.0.0.1", port: int = 8088, request_timeout: float = 30.0,
+                quiet: bool = True, max_queue: int = 1024, max_batch_items: int = 64,
+                max_wait_ms: float = 5, batch_size: int = 32) -> ThreadingHTTPServer:
+    """Build (but do not start serving) a server whose batching scheduler is already running"""
+    scheduler = MicroBatchScheduler(
+        ComparatorBatches(comparator, batch_size=batch_size, quiet=quiet),
+        max_batch_size=max_batch_items, max_latency_ms=max_wait_ms, max_queue=max_queue, name="request-batch",
+    )
+    handler = type("Handler", (ComparatorRequestHandler,), {
+        "comparator": comparator, "scheduler": scheduler, "request_timeout": request_timeout,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.scheduler = scheduler
+    server.quiet = quiet
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve EnhancedProductComparator over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--model", default="ner_model_improved", help="spaCy NER model path")
+    parser.add_argument("--max-queue", type=int, default=1024, help="queued requests before answering 503")
+    parser.add_argument("--max-batch-items", type=int, default=64, help="pairs/texts per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5, help="how long a batch waits to fill up")
+    parser.add_argument("--batch-size", type=int, default=32, help="nlp.pipe / encode batch size")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds a request waits for its result")
+    parser.add_argument("--verbose", action="store_true", help="keep comparator and access logs")
+    parser.add_argument("--instrument", action="store_true", help="time comparator stages and serve GET /metrics")
+    args = parser.parse_args(argv)
+
+    from product_comparator_enhanced import EnhancedProductComparator
+
+    quiet = not args.verbose
+    with logs_silenced(quiet):
+        comparator = EnhancedProductComparator(model_path=args.model)
+        comparator.warmup(background=False)
+    if args.instrument:
+        comparator.enable_instrumentation()
+
+    server = make_server(
+        comparator, args.host, args.port, request_timeout=args.timeout, quiet=quiet,
+        max_queue=args.max_queue, max_batch_items=args.max_batch_items,
+        max_wait_ms=args.max_wait_ms, batch_size=args.batch_size,
+    )
+    print(f"🚀 Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.scheduler.close(wait=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Streaming batch CLI for the enhanced product comparator
+
+Reads product pairs from CSV or JSONL (a file or stdin), runs them through
+`compare_many` in bounded chunks and writes one JSONL report per pair as soon
+as its chunk is done, so arbitrarily large inputs never sit in memory at once.
+
+    python compare_cli.py pairs.csv -o reports.jsonl
+    cat pairs.jsonl | python compare_cli.py --chunk-size 512 > reports.jsonl
+"""
+
+import argparse
+import codecs
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+DEFAULT_COLUMNS = ("product1", "product2")
+
+Pair = Tuple[int, str, str, Optional[str]]
+
+
+def detect_format(path: str, stream: TextIO) -> str:
+    """Guess csv/tsv/jsonl from the file extension, or from the first non-blank character on stdin"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if ext == ".tsv":
+        return "tsv"
+    if ext == ".csv":
+        return "csv"
+    head = stream.buffer.peek(64) if hasattr(stream, "buffer") and hasattr(stream.buffer, "peek") else b""
+    # Skip a UTF-8 byte order mark and leading whitespace before looking for "{"
+    first = head[len(codecs.BOM_UTF8):] if head.startswith(codecs.BOM_UTF8) else head
+    return "jsonl" if first.lstrip()[:1] == b"{" else "csv"
+
+
+def read_jsonl(stream: TextIO, columns: Tuple[str, str], id_column: Optional[str]) -> Iterator[Pair]:
+    """Yield (row number, text1, text2, id) from JSON lines, skipping malformed rows"""
+    for row_num, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            yield row_num, str(record[columns[0]]), str(record[columns[1]]), _row_id(record, id_column)
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"⚠️ Skipping line {row_num}: {e!r}", file=sys.stderr)
+
+
+def read_csv(stream: TextIO, columns: Tuple[str, str], id_column: Optional[str],
+             delimiter: str = ",") -> Iterator[Pair]:
+    """Yield (row number, text1, text2, id) from CSV, using the header when it names the columns"""
+    reader = csv.reader(stream, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    if columns[0] in header and columns[1] in header:
+        idx1, idx2 = header.index(columns[0]), header.index(columns[1])
+        id_idx = header.index(id_column) if id_column and id_column in header else None
+        rows = enumerate(reader, 2)
+    else:
+        # No usable header: the first two columns are the pair
+        idx1, idx2, id_idx = 0, 1, None
+        rows = chain([(1, header)], enumerate(reader, 2))
+    for row_num, row in rows:
+        if not row:
+            continue
+        try:
+            row_id = row[id_idx] if id_idx is not None else None
+            yield row_num, row[idx1], row[idx2], row_id
+        except IndexError:
+            print(f"⚠️ Skipping line {row_num}: expected at least {max(idx1, idx2) + 1} columns", file=sys.stderr)
+
+
+def _row_id(record: Dict, id_column: Optional[str]) -> Optional[str]:
+    if id_column and id_column in record:
+        return record[id_column]
+    return None
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` items without materializing it"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_report(out: TextIO, pair: Pair, report: Dict):
+    """Write one JSON line for a report, tagged with its source row"""
+    row_num, _, _, row_id = pair
+    record = {"row": row_num}
+    if row_id is not None:
+        record["id"] = row_id
+    record.update(report)
+    out.write(json.dumps(record, ensure_ascii=False, default=float) + "\n")
+
+
+def write_reports(out: TextIO, chunk: List[Pair], reports: List[Dict]):
+    """Write one JSON line per report and flush"""
+    for pair, report in zip(chunk, reports):
+        write_report(out, pair, report)
+    out.flush()
+
+
+def run(comparator, pairs: Iterable[Pair], out: TextIO, chunk_size: int = 256, batch_size: int = 32,
+        log: Optional[TextIO] = None) -> int:
+    """Compare `pairs` chunk by chunk, streaming reports to `out`; returns the number written"""
+    written = 0
+    start = time.perf_counter()
+    for chunk in chunked(pairs, chunk_size):
+        # The comparator logs progress with print(); keep it off the JSONL stream
+        with contextlib.redirect_stdout(log or sys.stderr):
+            reports = comparator.compare_many([(text1, text2) for _, text1, text2, _ in chunk],
+                                              batch_size=batch_size)
+        write_reports(out, chunk, reports)
+        written += len(reports)
+        elapsed = time.perf_counter() - start
+        print(f"📦 {written} pairs compared ({written / elapsed:.1f} pairs/s)", file=sys.stderr)
+    return written
+
+
+def run_parallel(runner, pairs: Iterable[Pair], out: TextIO, chunk_size: int = 256) -> int:
+    """Like `run`, but shards pairs across a `ParallelComparisonRunner` process pool"""
+    # Row metadata waits here while its texts are in flight; the runner bounds how far it reads ahead
+    in_flight = deque()
+
+    def texts():
+        for pair in pairs:
+            in_flight.append(pair)
+            yield pair[1], pair[2]
+
+    written = 0
+    start = time.perf_counter()
+    for report in runner.imap(texts()):
+        write_report(out, in_flight.popleft(), report)
+        written += 1
+        if written % chunk_size == 0:
+            out.flush()
+            elapsed = time.perf_counter() - start
+            print(f"📦 {written} pairs compared ({written / elapsed:.1f} pairs/s)", file=sys.stderr)
+    out.flush()
+    return written
+
+
+def open_input(path: str, encoding: str) -> TextIO:
+    if codecs.lookup(encoding).name == "utf-8":
+        # Drop a leading byte order mark so it does not end up in the first row
+        encoding = "utf-8-sig"
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding=encoding, newline="")
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def open_output(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8")
+
+
+def write_timings(instrumentation, path: Optional[str]):
+    """Stage timings to `path` (Prometheus text for *.prom, JSON otherwise)"""
+    if not path:
+        return
+    text = instrumentation.to_prometheus() if path.endswith(".prom") else instrumentation.to_json()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"⏱️  Stage timings written to {path}", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compare product pairs from CSV/JSONL and stream JSONL reports")
+    parser.add_argument("input", nargs="?", default="-", help="CSV or JSONL file of pairs (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--format", choices=["auto", "csv", "tsv", "jsonl"], default="auto",
+                        help="input format (default: from extension, or sniffed on stdin)")
+    parser.add_argument("--columns", nargs=2, default=list(DEFAULT_COLUMNS), metavar=("TEXT1", "TEXT2"),
+                        help="column/key names holding the two descriptions")
+    parser.add_argument("--id-column", default="id", help="optional column/key copied into each report")
+    parser.add_argument("--chunk-size", type=int, default=256, help="pairs held in memory per chunk")
+    parser.add_argument("--batch-size", type=int, default=32, help="nlp.pipe / encode batch size")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes, each with its own models (0 = one per core)")
+    parser.add_argument("--shard-size", type=int, default=64, help="pairs per worker task with --workers")
+    parser.add_argument("--model", default="ner_model_improved", help="spaCy NER model path")
+    parser.add_argument("--encoding", default="utf-8", help="input encoding")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log the comparator's per-pair extraction details (default: warnings only)")
+    parser.add_argument("--quiet", action="store_true", help="discard the comparator's progress logs")
+    parser.add_argument("--timings", metavar="PATH",
+                        help="write per-stage timings as JSON (or Prometheus text for *.prom); needs --workers 1")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"],
+                        help="profile the run and print the report to stderr; needs --workers 1")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.chunk_size < 1:
+        print("❌ --chunk-size must be at least 1", file=sys.stderr)
+        return 2
+
+    stream = open_input(args.input, args.encoding)
+    fmt = args.format if args.format != "auto" else detect_format(args.input, stream)
+    columns = tuple(args.columns)
+    if fmt == "jsonl":
+        pairs = read_jsonl(stream, columns, args.id_column)
+    else:
+        pairs = read_csv(stream, columns, args.id_column, delimiter="\t" if fmt == "tsv" else ",")
+
+    out = open_output(args.output)
+    log = open(os.devnull, "w") if args.quiet else None
+    try:
+        if args.workers != 1:
+            if args.timings or args.profile:
+                print("⚠️  --timings/--profile only apply with --workers 1; ignoring them", file=sys.stderr)
+            from parallel_runner import ParallelComparisonRunner
+
+            with ParallelComparisonRunner(args.workers or None, model_path=args.model, shard_size=args.shard_size,
+                                          batch_size=args.batch_size, quiet=True) as runner:
+                written = run_parallel(runner, pairs, out, chunk_size=args.chunk_size)
+        else:
+            from product_comparator_enhanced import EnhancedProductComparator
+
+            with contextlib.redirect_stdout(log or sys.stderr):
+                comparator = EnhancedProductComparator(model_path=args.model)
+            # Per-pair INFO lines cost formatting time on every row, so batch runs only log warnings
+            comparator.set_output("quiet" if args.quiet else "info" if args.verbose else "warning")
+            instrumentation = comparator.enable_instrumentation() if args.timings or args.profile else None
+            with instrumentation.profile(args.profile) if args.profile else contextlib.nullcontext():
+                written = run(comparator, pairs, out, chunk_size=args.chunk_size, batch_size=args.batch_size, log=log)
+            if instrumentation is not None:
+                comparator.disable_instrumentation()
+                write_timings(instrumentation, args.timings)
+                if args.profile:
+                    print(instrumentation.profile_report(), file=sys.stderr)
+    finally:
+        if args.input != "-":
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+        if log:
+            log.close()
+    print(f"✅ Wrote {written} reports", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from units import is_numeric_field, parse_length
+
+# ---
+# CATALOG DEDUPLICATION
+# Vectorized catalog-vs-catalog comparison. Every field column is reduced to
+# its distinct values, those are scored against each other once (rapidfuzz
+# cdist for the fuzzy stage and matrix multiplies over normalized embeddings
+# for the semantic stage, both in blocks of rows) and records are then compared by table
+# lookups in row blocks. A record pair is a duplicate candidate when every
+# field either record has would get a "Match" from compare_field.
+# ---
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving"""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def groups(self) -> List[List[int]]:
+        """Sets with more than one member, each sorted, ordered by first member"""
+        groups: Dict[int, List[int]] = {}
+        for x in range(len(self.parent)):
+            groups.setdefault(self.find(x), []).append(x)
+        return sorted((g for g in groups.values() if len(g) > 1), key=lambda g: g[0])
+
+
+class FieldColumn:
+    """One field across all records: distinct values, per-record value ids and a value-vs-value score table"""
+
+    def __init__(self, name: str, record_values: Sequence[str]):
+        self.name = name
+        self.values: List[str] = []
+        index: Dict[str, int] = {}
+        ids = []
+        for value in record_values:
+            if not value:
+                ids.append(-1)
+                continue
+            if value not in index:
+                index[value] = len(self.values)
+                self.values.append(value)
+            ids.append(index[value])
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.scores: Optional[np.ndarray] = None
+
+    def score_values(self, comparator, block_size: int = 2048):
+        """Fill `scores[a, b]` with compare_field's confidence for values a, b (0 for a mismatch)
+
+        Mirrors the default cascade tiers; an LLM tier added to the comparator is not applied here.
+        """
+        n = len(self.values)
+        scores = np.zeros((n, n), dtype=np.float32)
+        if not n:
+            self.scores = scores
+            return
+
+        # Pairs settled before string similarity (numeric or canonical), matched or not
+        decided = np.zeros((n, n), dtype=bool)
+
+        # Numeric stage: Diameter/Length pairs that both parse are decided by tolerance alone
+        # (same rule as units.lengths_match); values that do not parse go on to the string tiers
+        if is_numeric_field(self.name):
+            mm = np.array([parse_length(value) for value in self.values], dtype=np.float64)
+            parsed = ~np.isnan(mm)
+            numeric = parsed[:, None] & parsed[None, :]
+            decided |= numeric
+            a, b = np.where(parsed, mm, 0.0)[:, None], np.where(parsed, mm, 0.0)[None, :]
+            tolerance = np.maximum(comparator.numeric_abs_tol,
+                                   comparator.numeric_rel_tol * np.maximum(np.abs(a), np.abs(b)))
+            scores[numeric & (np.abs(a - b) <= tolerance)] = 1.0
+
+        # Canonical stage: alias tables decide same-canonical pairs and pairs of distinct known entries
+        canonicalizer = comparator.canonicalizer
+        if canonicalizer.handles(self.name):
+            canonical = [canonicalizer.canonicalize(self.name, value) for value in self.values]
+            known = canonicalizer.fields[self.name.lower()].canonicals
+            codes = {c: i for i, c in enumerate(dict.fromkeys(c for c in canonical if c is not None))}
+            code = np.array([codes[c] if c is not None else -1 for c in canonical], dtype=np.int64)
+            complete = np.array([c in known for c in canonical], dtype=bool)
+            same = (code[:, None] == code[None, :]) & (code[:, None] >= 0)
+            distinct_known = complete[:, None] & complete[None, :] & ~same
+            scores[same] = 1.0
+            decided |= same | distinct_known
+
+        # Fuzzy then semantic stage, one block of rows at a time so neither needs a full n x n
+        # intermediate; values are only encoded once a block has pairs that fall through to semantic
+        lowered = [value.lower() for value in self.values]
+        matrix = None
+        for start in range(0, n, block_size):
+            rows = slice(start, start + block_size)
+            block = scores[rows]
+            fuzzy = process.cdist(lowered[rows], lowered, scorer=fuzz.ratio, dtype=np.float32, workers=-1) / 100
+            settled = decided[rows].copy()
+            fuzzy_hit = ~settled & (fuzzy > comparator.fuzzy_threshold)
+            block[fuzzy_hit] = fuzzy[fuzzy_hit]
+            settled |= fuzzy_hit
+            if settled.all():
+                continue
+            if matrix is None:
+                matrix = self._normalized_embeddings(comparator)
+            cosine = matrix[rows] @ matrix.T
+            semantic_hit = ~settled & (cosine > comparator.semantic_threshold)
+            block[semantic_hit] = cosine[semantic_hit]
+
+        # Identical strings are exact matches
+        np.fill_diagonal(scores, 1.0)
+        self.scores = scores
+
+    def _normalized_embeddings(self, comparator) -> np.ndarray:
+        embeddings = comparator.encode_values(self.values)
+        matrix = np.asarray([embeddings[value] for value in self.values], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+
+class CatalogDeduplicator:
+    """Find candidate duplicate clusters in one catalog with the same thresholds as compare_field"""
+
+    def __init__(self, comparator, row_block_size: int = 1024, min_similarity: float = 0.0, blocker=None):
+        self.comparator = comparator
+        self.row_block_size = row_block_size
+        self.min_similarity = min_similarity
+        # Optional blocking.Blocker: only pairs inside its candidate groups are scored
+        self.blocker = blocker
+
+    def build_columns(self, records: List[Dict[str, str]]) -> List[FieldColumn]:
+        fields = sorted({field for record in records for field in record})
+        columns = [FieldColumn(field, [record.get(field, "") for record in records]) for field in fields]
+        for column in columns:
+            column.score_values(self.comparator)
+        return columns
+
+    def candidate_pairs(self, columns: List[FieldColumn], n_records: int,
+                        candidates: Optional[Sequence[Sequence[int]]] = None) -> List[Tuple[int, int, float]]:
+        """(i, j, overall similarity) for every duplicate pair, i < j
+
+        `candidates` optionally restricts the comparison to pairs inside the
+        given groups of record indices (e.g. blocks from a blocking stage).
+        """
+        groups = candidates if candidates is not None else [range(n_records)]
+        pairs = []
+        seen = set()
+        for group in groups:
+            group = np.asarray(sorted(set(group)), dtype=np.int64)
+            for i, j, score in self._group_pairs(columns, group):
+                if (i, j) not in seen:
+                    seen.add((i, j))
+                    pairs.append((i, j, score))
+        pairs.sort()
+        return pairs
+
+    def _group_pairs(self, columns: List[FieldColumn], members: np.ndarray):
+        """Compare all pairs within `members`, `row_block_size` rows at a time"""
+        m = len(members)
+        for start in range(0, m, self.row_block_size):
+            rows = members[start:start + self.row_block_size]
+            all_match = np.ones((len(rows), m), dtype=bool)
+            total = np.zeros((len(rows), m), dtype=np.float32)
+            fields = np.zeros((len(rows), m), dtype=np.int32)
+            for column in columns:
+                row_ids = column.ids[rows][:, None]
+                col_ids = column.ids[members][None, :]
+                row_has, col_has = row_ids >= 0, col_ids >= 0
+                both = row_has & col_has
+                in_union = row_has | col_has
+                score = np.where(both, column.scores[np.maximum(row_ids, 0), np.maximum(col_ids, 0)], 0.0)
+                # A field present on only one side, or scored 0, is a mismatch
+                all_match &= ~in_union | (score > 0)
+                total += score
+                fields += in_union
+            with np.errstate(invalid="ignore", divide="ignore"):
+                overall = np.where(fields > 0, total / np.maximum(fields, 1), 0.0)
+            keep = all_match & (fields > 0) & (overall >= self.min_similarity)
+            # Upper triangle only: member index strictly greater than the row's own index
+            keep &= np.arange(m)[None, :] > (start + np.arange(len(rows)))[:, None]
+            for r, c in zip(*np.nonzero(keep)):
+                yield int(rows[r]), int(members[c]), float(overall[r, c])
+
+    def deduplicate(self, texts: List[str], batch_size: int = 32,
+                    candidates: Optional[Sequence[Sequence[int]]] = None) -> Dict:
+        """Extract every text once, score all (or only `candidates`) pairs and cluster the duplicates"""
+        entities = self.comparator.extract_many(texts, batch_size=batch_size)
+        records = [entities[text] for text in texts]
+        if candidates is None and self.blocker is not None:
+            candidates = self.blocker.candidate_groups(records)
+        columns = self.build_columns(records)
+        pairs = self.candidate_pairs(columns, len(records), candidates)
+
+        clusters = UnionFind(len(records))
+        for i, j, _ in pairs:
+            clusters.union(i, j)
+        return {
+            "records": records,
+            "pairs": pairs,
+            "clusters": clusters.groups(),
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find duplicate products in a catalog (one description per line)")
+    parser.add_argument("input", nargs="?", default="-", help="text file of descriptions (default: stdin)")
+    parser.add_argument("--min-similarity", type=float, default=0.0, help="minimum overall similarity of a pair")
+    parser.add_argument("--block", action="store_true", help="only compare within Material/Grade/Standard blocks")
+    parser.add_argument("--window", type=int, default=8, help="sorted-neighborhood window on Diameter with --block")
+    parser.add_argument("--model", default="ner_model_improved", help="spaCy NER model path")
+    args = parser.parse_args(argv)
+
+    from blocking import Blocker
+    from product_comparator_enhanced import EnhancedProductComparator
+
+    if args.input == "-":
+        texts = [line.strip() for line in sys.stdin if line.strip()]
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    comparator = EnhancedProductComparator(model_path=args.model)
+    blocker = Blocker(window=args.window, canonicalizer=comparator.canonicalizer) if args.block else None
+    result = CatalogDeduplicator(comparator, min_similarity=args.min_similarity, blocker=blocker).deduplicate(texts)
+
+    print(f"\n🔁 {len(result['clusters'])} duplicate clusters in {len(texts)} products", file=sys.stderr)
+    for cluster in result["clusters"]:
+        print(json.dumps({"cluster": [texts[i] for i in cluster]}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+# ---
+# EMBEDDING CACHE
+# Content-addressed cache for field value embeddings: an in-memory LRU tier
+# plus an optional memory-mapped on-disk tier that survives restarts
+# ---
+
+def normalize_value(value: str) -> str:
+    """Normalize a field value before hashing and encoding
+
+    paraphrase-MiniLM-L6-v2 uses an uncased tokenizer, so lowercasing and
+    collapsing whitespace does not change the embedding.
+    """
+    return " ".join(str(value).lower().split())
+
+
+class DiskEmbeddingStore:
+    """Append-only float32 matrix on disk, read back through np.memmap
+
+    Layout inside `path`:
+      meta.json    - model name and embedding dimension
+      vectors.f32  - one row per key, raw float32
+      keys.txt     - one hex key per line, same order as the rows
+    The vector row is written before its key, so a crash can only leave an
+    orphan row: loads skip it and the next append truncates it away, so row i
+    is always the vector of key line i. Appends take an exclusive lock on
+    keys.txt so several worker processes can share one store.
+    """
+
+    def __init__(self, path: str, model_name: str):
+        self.path = path
+        self.model_name = model_name
+        self.dim = None
+        self._rows: Dict[str, int] = {}
+        self._mmap = None
+        # Complete key lines counted so far and the byte offset they end at
+        self._key_lines = 0
+        self._keys_offset = 0
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._keys_path = os.path.join(path, "keys.txt")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._load()
+
+    def _load(self):
+        """Read the key index and check it against the vector file"""
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if meta.get("model") != self.model_name:
+            raise ValueError(f"Embedding store at {self.path} was built with {meta.get('model')}, not {self.model_name}")
+        self.dim = meta["dim"]
+
+        n_rows = os.path.getsize(self._vectors_path) // (self.dim * 4) if os.path.exists(self._vectors_path) else 0
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path) as f:
+                for row, line in enumerate(f):
+                    if row >= n_rows or not line.endswith("\n"):
+                        break
+                    self._rows[line.strip()] = row
+
+    def _count_key_lines(self) -> int:
+        """Complete lines in keys.txt, reading only what was appended since the last count"""
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            tail = f.read()
+        end = tail.rfind(b"\n") + 1
+        self._key_lines += tail.count(b"\n", 0, end)
+        self._keys_offset += end
+        return self._key_lines
+
+    def _remap(self):
+        """Map the vector file, picking up rows appended since the last map"""
+        n_rows = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        self._mmap = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(n_rows, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the stored vector for `key`, or None"""
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            self._remap()
+        return np.array(self._mmap[row])
+
+    @contextmanager
+    def _append_lock(self):
+        """Open keys.txt for appending while holding an exclusive lock on it"""
+        with open(self._keys_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    f.flush()
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def put_many(self, items: List):
+        """Append (key, vector) pairs that are not stored yet"""
+        items = [(key, vector) for key, vector in items if key not in self._rows]
+        if not items:
+            return
+        if self.dim is None:
+            self.dim = int(len(items[0][1]))
+            with open(self._meta_path, "w") as f:
+                json.dump({"model": self.model_name, "dim": self.dim}, f)
+
+        block = np.asarray([vector for _, vector in items], dtype=np.float32)
+        with self._append_lock() as keys_file:
+            start = self._count_key_lines()
+            if keys_file.tell() != self._keys_offset:
+                # A crash cut a key line short: drop it with its vector
+                keys_file.truncate(self._keys_offset)
+            with open(self._vectors_path, "ab") as f:
+                # Drop orphan rows a crash left behind, so the new rows line up with their keys
+                f.truncate(start * self.dim * 4)
+                f.write(block.tobytes())
+            keys_file.write("".join(f"{key}\n" for key, _ in items))
+        for offset, (key, _) in enumerate(items):
+            self._rows[key] = start + offset
+
+
+class EmbeddingCache:
+    """Bounded embedding cache keyed on (model name, normalized value)"""
+
+    def __init__(self, model_name: str, max_entries: int = 100_000, cache_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk = None
+        if cache_dir:
+            model_dir = hashlib.sha1(model_name.encode("utf-8")).hexdigest()[:12]
+            self.disk = DiskEmbeddingStore(os.path.join(cache_dir, model_dir), model_name)
+
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, value: str) -> str:
+        """Content address for a value under this cache's model"""
+        payload = f"{self.model_name}\0{normalize_value(value)}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, value: str) -> Optional[np.ndarray]:
+        """Look a value up in memory, then on disk; None on a miss"""
+        key = self.key(value)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+            if self.disk is not None:
+                vector = self.disk.get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vector
+            self.misses += 1
+            return None
+
+    def put(self, value: str, vector: np.ndarray):
+        """Store a single embedding in both tiers"""
+        self.put_many([(value, vector)])
+
+    def put_many(self, items: List):
+        """Store (value, vector) pairs in both tiers"""
+        keyed = [(self.key(value), np.asarray(vector, dtype=np.float32)) for value, vector in items]
+        with self._lock:
+            for key, vector in keyed:
+                self._remember(key, vector)
+            if self.disk is not None:
+                self.disk.put_many(keyed)
+
+    def encode(self, values: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> List[np.ndarray]:
+        """Return embeddings for `values`, encoding only the misses in one call
+
+        `encode_fn` receives the distinct normalized values that were not cached
+        and must return one vector per value.
+        """
+        vectors = [self.get(value) for value in values]
+        missing = list(dict.fromkeys(
+            normalize_value(value) for value, vector in zip(values, vectors) if vector is None
+        ))
+        if missing:
+            encoded = dict(zip(missing, encode_fn(missing)))
+            self.put_many(encoded.items())
+            vectors = [
+                vector if vector is not None else np.asarray(encoded[normalize_value(value)], dtype=np.float32)
+                for value, vector in zip(values, vectors)
+            ]
+        return vectors
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+        }
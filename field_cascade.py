@@ -0,0 +1,303 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from llm_cache import LLMResultCache, prompt_template_hash
+from metrics import FINE_LATENCY_BUCKETS_MS, Histogram
+
+# ---
+# FIELD CASCADE
+# compare_field as an ordered list of tiers, cheapest first:
+# exact -> canonical -> numeric -> fuzzy -> semantic -> (optional) LLM.
+# Each tier either returns a result, which ends the cascade, or None to hand
+# the pair to the next one. Every tier has its own call/hit counters and a
+# timing histogram, so thresholds can be tuned against where time is spent.
+# ---
+
+FieldResult = Tuple[str, str, str, float]
+
+MISMATCH = "❌ Mismatch"
+
+
+class Tier(ABC):
+    """One cascade step; `decide` returns a result to stop or None to fall through"""
+
+    name = "tier"
+
+    @abstractmethod
+    def decide(self, val1: str, val2: str, field: Optional[str], embeddings: Optional[Dict]) -> Optional[FieldResult]:
+        """Result for the pair, or None to hand it to the next tier"""
+
+
+class ExactTier(Tier):
+    """Empty and identical values; a value present on one side only is a mismatch"""
+
+    name = "exact"
+
+    def decide(self, val1, val2, field, embeddings):
+        if not val1 and not val2:
+            return ("⚪ Not Mentioned", val1, val2, 1.0)
+        if val1 == val2:
+            return ("✅ Exact Match", val1, val2, 1.0)
+        if not val1 or not val2:
+            return (MISMATCH, val1, val2, 0.0)
+        return None
+
+
+class CanonicalTier(Tier):
+    """Alias tables: same canonical form matches, two distinct known entries mismatch"""
+
+    name = "canonical"
+
+    def __init__(self, canonicalizer):
+        self.canonicalizer = canonicalizer
+
+    def decide(self, val1, val2, field, embeddings):
+        decision = self.canonicalizer.compare(field, val1, val2)
+        if decision is True:
+            return ("✅ Canonical Match", val1, val2, 1.0)
+        if decision is False:
+            return (MISMATCH, val1, val2, 0.0)
+        return None
+
+
+class NumericTier(Tier):
+    """Diameter/Length values compared in millimetres within the comparator's tolerances"""
+
+    name = "numeric"
+
+    def __init__(self, comparator):
+        self.comparator = comparator
+
+    def decide(self, val1, val2, field, embeddings):
+        return self.comparator.compare_numeric(val1, val2, field)
+
+
+class FuzzyTier(Tier):
+    """Character-level ratio above `comparator.fuzzy_threshold`"""
+
+    name = "fuzzy"
+
+    def __init__(self, comparator):
+        self.comparator = comparator
+
+    def decide(self, val1, val2, field, embeddings):
+        ratio = self.comparator.fuzzy_ratio(val1, val2)
+        if ratio > self.comparator.fuzzy_threshold:
+            return ("✅ Fuzzy Match", val1, val2, ratio)
+        return None
+
+
+class SemanticTier(Tier):
+    """Embedding cosine above `comparator.semantic_threshold`, using pre-encoded `embeddings` when given"""
+
+    name = "semantic"
+
+    def __init__(self, comparator):
+        self.comparator = comparator
+
+    def decide(self, val1, val2, field, embeddings):
+        similarity = self.comparator.semantic_similarity(val1, val2, embeddings)
+        if similarity > self.comparator.semantic_threshold:
+            return ("✅ Semantic Match", val1, val2, similarity)
+        return None
+
+
+class LLMTier(Tier):
+    """Last resort: ask the LLM whether two values mean the same thing
+
+    Answers are cached in the comparator's LLMResultCache (when it has one)
+    under an order-independent key, so each pair of values is asked once.
+    """
+
+    name = "llm"
+
+    def __init__(self, comparator, min_confidence: float = 0.8):
+        self.comparator = comparator
+        self.min_confidence = min_confidence
+        self.template_hash = prompt_template_hash(self.build_prompt("{field}", "{a}", "{b}"))
+
+    @staticmethod
+    def build_prompt(field: str, val1: str, val2: str) -> str:
+        return f"""
+Two construction-material product descriptions give these values for the field "{field}":
+A: {val1}
+B: {val2}
+
+Do A and B refer to the same {field}? Return only JSON: {{"same": true or false, "confidence": 0.0 to 1.0}}
+"""
+
+    def _ask(self, field: str, val1: str, val2: str) -> Optional[Dict]:
+        client, cache = self.comparator.llm_client, self.comparator.llm_cache
+        low, high = sorted([val1, val2])
+        key = LLMResultCache.key(f"{field}\0{low}\0{high}", client.model, self.template_hash)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        answer = client.complete(self.build_prompt(field, low, high))
+        start, end = answer.find("{"), answer.rfind("}")
+        data = json.loads(answer[start:end + 1]) if start != -1 and end > start else None
+        if not isinstance(data, dict):
+            return None
+        if cache is not None:
+            cache.put(key, data)
+        return data
+
+    def decide(self, val1, val2, field, embeddings):
+        if self.comparator.llm_client is None:
+            return None
+        try:
+            data = self._ask(field or "value", val1, val2)
+        except Exception:
+            return None
+        if not isinstance(data, dict):
+            # No usable answer: leave the pair undecided
+            return None
+        try:
+            confidence = float(data.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            return None
+        if data.get("same") is True and confidence >= self.min_confidence:
+            return ("✅ LLM Match", val1, val2, confidence)
+        return None
+
+
+class TierStats:
+    """Counters and timing histogram for one tier"""
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.matches = 0
+        self.time_ms = Histogram(FINE_LATENCY_BUCKETS_MS)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, result: Optional[FieldResult]):
+        self.time_ms.observe(elapsed_ms)
+        with self._lock:
+            self.calls += 1
+            if result is not None:
+                self.hits += 1
+                if result[3] > 0:
+                    self.matches += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            calls, hits, matches = self.calls, self.hits, self.matches
+        return {
+            "calls": calls,
+            "hits": hits,
+            "matches": matches,
+            "hit_rate": hits / calls if calls else 0.0,
+            "time_ms": self.time_ms.snapshot(),
+        }
+
+
+class FieldCascade:
+    """Ordered tiers with per-tier stats; pairs no tier decides are mismatches"""
+
+    # Upper bound on decisions remembered between `reaches` and `compare`
+    PENDING_LIMIT = 100_000
+
+    def __init__(self, tiers: List[Tier]):
+        self.tiers: List[Tier] = []
+        self._stats: Dict[str, TierStats] = {}
+        self.unresolved = 0
+        # (field, val1, val2) -> (next tier position, result or None, elapsed ms per tier run),
+        # left by `reaches` so `compare` does not run those tiers again
+        self._pending: Dict[Tuple, Tuple[int, Optional[FieldResult], List[float]]] = {}
+        for tier in tiers:
+            self.add_tier(tier)
+
+    @classmethod
+    def default(cls, comparator) -> "FieldCascade":
+        """exact -> canonical -> numeric -> fuzzy -> semantic, reading thresholds from `comparator`"""
+        return cls([
+            ExactTier(),
+            CanonicalTier(comparator.canonicalizer),
+            NumericTier(comparator),
+            FuzzyTier(comparator),
+            SemanticTier(comparator),
+        ])
+
+    def names(self) -> List[str]:
+        return [tier.name for tier in self.tiers]
+
+    def add_tier(self, tier: Tier, before: Optional[str] = None):
+        """Append `tier`, or insert it ahead of the tier called `before`"""
+        if tier.name in self._stats:
+            raise ValueError(f"cascade already has a '{tier.name}' tier")
+        position = self.names().index(before) if before is not None else len(self.tiers)
+        self.tiers.insert(position, tier)
+        self._stats[tier.name] = TierStats()
+        self._pending.clear()
+
+    def remove_tier(self, name: str):
+        position = self.names().index(name)
+        del self.tiers[position]
+        del self._stats[name]
+        self._pending.clear()
+
+    def _run(self, val1: str, val2: str, field: Optional[str], embeddings: Optional[Dict],
+             start: int, stop: int) -> Tuple[int, Optional[FieldResult], List[float]]:
+        """Run tiers[start:stop] until one decides: (its position or `stop`, result, elapsed ms per tier)"""
+        timings = []
+        for position in range(start, stop):
+            started = time.perf_counter()
+            result = self.tiers[position].decide(val1, val2, field, embeddings)
+            timings.append((time.perf_counter() - started) * 1000)
+            if result is not None:
+                return position, result, timings
+        return stop, None, timings
+
+    def compare(self, val1: str, val2: str, field: Optional[str] = None,
+                embeddings: Optional[Dict] = None) -> FieldResult:
+        """First tier result for the pair, timing every tier that runs"""
+        # Resume after the tiers `reaches` already ran for this pair, keeping their timings
+        position, result, timings = self._pending.pop((field, val1, val2), (0, None, []))
+        if result is None:
+            position, result, rest = self._run(val1, val2, field, embeddings, position, len(self.tiers))
+            timings = timings + rest
+        for number, elapsed in enumerate(timings):
+            self._stats[self.tiers[number].name].record(elapsed, result if number == position else None)
+        if result is not None:
+            return result
+        self.unresolved += 1
+        return (MISMATCH, val1, val2, 0.0)
+
+    def reaches(self, name: str, val1: str, val2: str, field: Optional[str] = None) -> bool:
+        """Whether the pair would get past every tier ahead of `name`
+
+        The tiers run here and their decision are remembered for the next
+        `compare` of the same pair, which records them in stats and runs only
+        the tiers from `name` on.
+        """
+        names = self.names()
+        if name not in names:
+            return False
+        stop = names.index(name)
+        key = (field, val1, val2)
+        position, result, timings = self._pending.get(key, (0, None, []))
+        if result is None and position < stop:
+            if len(self._pending) >= self.PENDING_LIMIT:
+                self._pending.clear()
+            position, result, rest = self._run(val1, val2, field, None, position, stop)
+            self._pending[key] = (position, result, timings + rest)
+        return position >= stop
+
+    def stats(self) -> Dict:
+        """Per-tier calls, hits (decided), matches, hit rate and timing histogram, in cascade order"""
+        return {
+            "order": self.names(),
+            "tiers": {tier.name: self._stats[tier.name].snapshot() for tier in self.tiers},
+            "unresolved": self.unresolved,
+        }
+
+    def reset_stats(self):
+        for name in self._stats:
+            self._stats[name] = TierStats()
+        self.unresolved = 0
+        self._pending.clear()
@@ -0,0 +1,197 @@
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from functools import wraps
+from typing import Dict, Iterable, List, Optional
+
+from metrics import FINE_LATENCY_BUCKETS_MS, Histogram
+
+# ---
+# INSTRUMENTATION
+# Per-stage timers, call/error counters and latency histograms for the
+# comparator's hot path, exported as JSON or Prometheus text, plus an optional
+# cProfile/pyinstrument capture. Stages are timed by wrapping the comparator's
+# methods on the instance while instrumentation is attached; detached (the
+# default) nothing is wrapped, so the disabled cost is zero.
+# ---
+
+DEFAULT_STAGES = (
+    "compare_products",
+    "compare_many",
+    "extract_many",
+    "extract_structured",
+    "extract_with_regex",
+    "extract_with_ner",
+    "extract_with_llm",
+    "collect_llm",
+    "extract_with_llm_batch",
+    "merge_extractions",
+    "encode",
+    "semantic_similarity",
+    "compare_field",
+    "build_report",
+    "print_report",
+)
+
+
+class StageStats:
+    """Calls, errors and a latency histogram for one stage"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.time_ms = Histogram(FINE_LATENCY_BUCKETS_MS)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, failed: bool = False):
+        self.time_ms.observe(elapsed_ms)
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            calls, errors = self.calls, self.errors
+        return {"calls": calls, "errors": errors, "time_ms": self.time_ms.snapshot()}
+
+
+class Instrumentation:
+    """Stage timings for one object (normally an EnhancedProductComparator)
+
+    `attach(obj)` wraps the methods named in `stages` on that instance;
+    `detach()` restores them. Timings are inclusive: a stage's time includes
+    the stages it calls.
+    """
+
+    def __init__(self, stages: Iterable[str] = DEFAULT_STAGES):
+        self.stage_names = list(stages)
+        self.stages: Dict[str, StageStats] = {}
+        self.enabled = False
+        self._target = None
+        self._wrapped: List[str] = []
+        self._lock = threading.Lock()
+        self.last_profile = None
+
+    def _stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+        return stats
+
+    def _wrap(self, name: str, method):
+        stats = self._stats(name)
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.record((time.perf_counter() - started) * 1000, failed=failed)
+        return timed
+
+    def attach(self, target):
+        """Start timing `target`'s stage methods"""
+        if self._target is not None:
+            self.detach()
+        for name in self.stage_names:
+            method = getattr(target, name, None)
+            if callable(method):
+                setattr(target, name, self._wrap(name, method))
+                self._wrapped.append(name)
+        self._target = target
+        self.enabled = True
+        return self
+
+    def detach(self):
+        """Remove the wrappers; collected stats are kept"""
+        if self._target is not None:
+            for name in self._wrapped:
+                self._target.__dict__.pop(name, None)
+        self._target = None
+        self._wrapped = []
+        self.enabled = False
+
+    @contextlib.contextmanager
+    def profile(self, kind: str = "cprofile"):
+        """Capture a cProfile (or pyinstrument, if installed) profile of the block; see `profile_report`"""
+        if kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("pyinstrument is not installed: pip install pyinstrument")
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield profiler
+            finally:
+                profiler.stop()
+        elif kind == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+        else:
+            raise ValueError(f"unknown profiler {kind!r} (use 'cprofile' or 'pyinstrument')")
+        self.last_profile = (kind, profiler)
+
+    def profile_report(self, limit: int = 25, sort: str = "cumulative") -> str:
+        """Text report of the last captured profile"""
+        if self.last_profile is None:
+            return ""
+        kind, profiler = self.last_profile
+        if kind == "pyinstrument":
+            return profiler.output_text()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def snapshot(self) -> Dict:
+        """{stage: calls, errors, time_ms histogram with p50/p95/p99}, busiest stages first"""
+        stages = {name: stats.snapshot() for name, stats in list(self.stages.items())}
+        ordered = sorted(stages.items(), key=lambda item: item[1]["time_ms"]["sum"], reverse=True)
+        return {"enabled": self.enabled, "stages": dict(ordered)}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, default=float)
+
+    def to_prometheus(self, prefix: str = "product_comparator") -> str:
+        """Prometheus text exposition: one `<prefix>_stage_seconds` histogram and an error counter per stage"""
+        metric = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {metric} Time spent in each comparator stage.",
+            f"# TYPE {metric} histogram",
+        ]
+        errors = []
+        for name, stats in sorted(self.stages.items()):
+            view = stats.time_ms.cumulative()
+            for bound, count in view["buckets"]:
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound / 1000:g}"}} {count}')
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {view["count"]}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {view["sum"] / 1000:.9g}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {view["count"]}')
+            errors.append(f'{prefix}_stage_errors_total{{stage="{name}"}} {stats.errors}')
+        lines.append(f"# HELP {prefix}_stage_errors_total Calls of each stage that raised.")
+        lines.append(f"# TYPE {prefix}_stage_errors_total counter")
+        lines.extend(errors)
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.stages = {name: StageStats() for name in self.stages}
+        if self._target is not None:
+            # Wrappers hold their StageStats; rewrap so they record into the fresh ones
+            target = self._target
+            self.detach()
+            self.attach(target)
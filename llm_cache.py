@@ -0,0 +1,127 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from embedding_cache import normalize_value
+
+# ---
+# LLM RESULT CACHE
+# Durable SQLite cache of LLM field extractions keyed on normalized text,
+# model name and prompt template, with TTL and size-based eviction
+# ---
+
+def prompt_template_hash(template: str) -> str:
+    """Short fingerprint of a prompt template, so edited prompts miss the cache"""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMResultCache:
+    """SQLite-backed cache of per-description LLM extraction results"""
+
+    def __init__(self, path: str, ttl_seconds: float = 30 * 24 * 3600, max_entries: int = 1_000_000,
+                 evict_every: int = 1000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_results_accessed ON llm_results (accessed)")
+        self._db.commit()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, model: str, template_hash: str) -> str:
+        """Cache key for one description under a model and prompt template"""
+        payload = f"{model}\0{template_hash}\0{normalize_value(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Fetch unexpired results for `keys`; missing keys are absent from the result"""
+        if not keys:
+            return {}
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, value FROM llm_results WHERE key IN ({placeholders}) AND created >= ?",
+                    (*chunk, now - self.ttl_seconds)
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+            if found:
+                self._db.executemany("UPDATE llm_results SET accessed = ? WHERE key = ?",
+                                     [(now, key) for key in found])
+                self._db.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Fetch one unexpired result, or None"""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: List[Tuple[str, Dict]]):
+        """Store (key, result) pairs, evicting expired and least recently used rows periodically"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO llm_results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), now, now) for key, value in items]
+            )
+            self._puts_since_evict += len(items)
+            if self._puts_since_evict >= self.evict_every:
+                self._evict(now)
+            self._db.commit()
+
+    def put(self, key: str, value: Dict):
+        """Store one result"""
+        self.put_many([(key, value)])
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the least recently used rows above `max_entries`"""
+        self._puts_since_evict = 0
+        self._db.execute("DELETE FROM llm_results WHERE created < ?", (now - self.ttl_seconds,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM llm_results").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM llm_results WHERE key IN "
+                "(SELECT key FROM llm_results ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and stored row count"""
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM llm_results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+        }
+
+    def close(self):
+        """Flush and close the database"""
+        with self._lock:
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,154 @@
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# ---
+# GROQ LLM CLIENT
+# Thread-pooled chat completion client: one keep-alive connection pool,
+# capped concurrency, and coalescing of identical in-flight prompts
+# ---
+
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+DEFAULT_LLM_MODEL = "llama3-70b-8192"
+
+LLM_FIELD_HINTS = {
+    "Material": "e.g., TMT, OPC, PC Strand",
+    "Grade": "e.g., Fe500, OPC 43, Class I",
+    "Diameter": "in mm",
+    "Length": "in mm",
+    "Form": "e.g., Loose, Bag, Coil",
+    "Standard": "e.g., IS 1786, ASTM",
+}
+
+
+def field_list(fields: Optional[List[str]] = None) -> str:
+    """Bulleted field list for a prompt; all fields when `fields` is None"""
+    fields = LLM_FIELD_HINTS if fields is None else fields
+    return "\n".join(f"- {field} ({LLM_FIELD_HINTS[field]})" for field in fields)
+
+
+def build_batch_prompt(texts: List[str], fields: Optional[List[str]] = None) -> str:
+    """Pack several descriptions into one prompt asking for an indexed JSON array"""
+    fields = field_list(fields)
+    items = "\n".join(f"[{index}] {text}" for index, text in enumerate(texts))
+    return f"""
+Extract the following fields from each numbered product description:
+{fields}
+
+Descriptions:
+{items}
+
+Return only a JSON array with one object per description, in any order.
+Each object must have an "index" key with the description's number plus the fields above.
+Use null for fields that are not mentioned. No other text.
+"""
+
+
+def parse_batch_response(result: str, count: int) -> Dict[int, Dict]:
+    """Split a batched answer back into {index: fields}; malformed items are left out"""
+    start, end = result.find("["), result.rfind("]")
+    if start == -1 or end < start:
+        return {}
+    try:
+        data = json.loads(result[start:end + 1])
+    except json.JSONDecodeError:
+        data = _decode_objects(result[start:end + 1])
+
+    parsed = {}
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("index"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            parsed[index] = {field: value for field, value in item.items() if field != "index"}
+    return parsed
+
+
+def _decode_objects(text: str) -> List:
+    """Salvage the well-formed objects out of a JSON array that does not parse as a whole"""
+    decoder = json.JSONDecoder()
+    objects = []
+    position = text.find("{")
+    while position != -1:
+        try:
+            item, end = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            position = text.find("{", position + 1)
+            continue
+        objects.append(item)
+        position = text.find("{", end)
+    return objects
+
+
+class GroqClient:
+    """Concurrent Groq chat client shared by every extraction call"""
+
+    def __init__(self, api_key: str, model: str = DEFAULT_LLM_MODEL, max_concurrency: int = 8,
+                 timeout: float = 10, temperature: float = 0.1):
+        self.model = model
+        self.timeout = timeout
+        self.temperature = temperature
+
+        # Imported here so modules that only need the prompt helpers stay light
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Pool size matches the worker count so no request waits on a socket
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency))
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="groq")
+        self._inflight: Dict[Tuple[str, float], Future] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.requests_sent = 0
+        self.coalesced = 0
+
+    def _post(self, prompt: str, temperature: float) -> str:
+        """Send one chat completion and return the message content"""
+        response = self.session.post(
+            GROQ_CHAT_URL,
+            json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature
+            },
+            timeout=self.timeout
+        )
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    def submit(self, prompt: str, temperature: Optional[float] = None) -> Future:
+        """Queue a prompt; identical prompts already in flight share one request"""
+        temperature = self.temperature if temperature is None else temperature
+        key = (prompt, temperature)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._executor.submit(self._post, prompt, temperature)
+            self._inflight[key] = future
+            self.requests_sent += 1
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: Tuple[str, float], future: Future):
+        """Drop a finished request so later identical prompts go out again"""
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def complete(self, prompt: str, temperature: Optional[float] = None) -> str:
+        """Blocking convenience wrapper around `submit`"""
+        return self.submit(prompt, temperature).result()
+
+    def close(self):
+        """Wait for in-flight requests and release pooled connections"""
+        self._executor.shutdown(wait=True)
+        self.session.close()
@@ -0,0 +1,91 @@
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# ---
+# METRICS
+# Small thread-safe histogram with fixed bucket bounds, for queue depths,
+# batch sizes and latencies
+# ---
+
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Microsecond resolution at the low end, for per-call steps such as one field comparison
+FINE_LATENCY_BUCKETS_MS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05) + LATENCY_BUCKETS_MS
+
+
+class Histogram:
+    """Cumulative-count histogram over fixed upper bounds, plus an overflow bucket"""
+
+    def __init__(self, bounds: Sequence[float] = SIZE_BUCKETS):
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100); `max` for the overflow bucket"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q / 100 * self.count
+            seen = 0
+            for bound, count in zip(self.bounds, self.counts):
+                seen += count
+                if seen >= rank and count:
+                    return min(bound, self.max)
+            return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly view: count, sum, mean, min/max, p50/p95/p99 and non-empty buckets"""
+        with self._lock:
+            buckets: List = [
+                [f"<={bound:g}", count] for bound, count in zip(self.bounds, self.counts) if count
+            ]
+            if self.counts[-1]:
+                buckets.append([f">{self.bounds[-1]:g}", self.counts[-1]])
+            count, total, low, high = self.count, self.total, self.min, self.max
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "min": low,
+            "max": high,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": buckets,
+        }
+
+    def cumulative(self) -> Dict:
+        """Prometheus-style view: (upper bound, observations <= bound) pairs plus count and sum"""
+        with self._lock:
+            running, buckets = 0, []
+            for bound, count in zip(self.bounds, self.counts):
+                running += count
+                buckets.append((bound, running))
+            return {"buckets": buckets, "count": self.count, "sum": self.total}
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
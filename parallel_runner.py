@@ -0,0 +1,126 @@
+import multiprocessing as mp
+import os
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from reporting import logs_silenced
+
+# ---
+# PARALLEL RUNNER
+# Shards product pairs across a process pool. Every worker loads the NER and
+# MiniLM models once in its initializer and keeps them for all of its shards;
+# reports come back in input order.
+# ---
+
+_comparator = None
+_batch_size = 32
+# Why this worker could not build its comparator; raised by every task it gets
+_init_error: Optional[str] = None
+
+
+def _init_worker(model_path: str, batch_size: int, torch_threads: Optional[int], quiet: bool):
+    """Pool initializer: build one comparator per worker process
+
+    Failures are stored instead of raised: a raising initializer kills the
+    worker, the pool starts a replacement that fails the same way, and
+    `map` never returns. The stored error is raised by the first task.
+    """
+    global _comparator, _batch_size, _init_error
+    _batch_size = batch_size
+    try:
+        if torch_threads:
+            # One intra-op thread per process; the pool already uses every core
+            import torch
+            torch.set_num_threads(torch_threads)
+
+        from product_comparator_enhanced import EnhancedProductComparator
+        with logs_silenced(quiet):
+            _comparator = EnhancedProductComparator(model_path=model_path)
+            _comparator.warmup(background=False)
+        if quiet:
+            _comparator.set_output("quiet")
+    except Exception as e:
+        _comparator = None
+        _init_error = f"{type(e).__name__}: {e}"
+
+
+def _compare_shard(shard: List[Tuple[str, str]]) -> List[Dict]:
+    """Pool task: compare one shard with the worker's comparator"""
+    if _init_error is not None:
+        raise RuntimeError(f"comparator worker failed to start: {_init_error}")
+    return _comparator.compare_many(shard, batch_size=_batch_size)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container/taskset limits)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class ParallelComparisonRunner:
+    """Process pool of warmed-up comparators
+
+    `shard_size` pairs go to a worker per task, which keeps `nlp.pipe` and the
+    embedding batches full while still spreading work evenly. At most
+    `max_pending` shards are in flight, so `imap` can consume an unbounded
+    stream without reading it all into memory.
+    """
+
+    def __init__(self, workers: Optional[int] = None, model_path: str = "ner_model_improved",
+                 shard_size: int = 64, batch_size: int = 32, torch_threads: Optional[int] = 1,
+                 max_pending: Optional[int] = None, quiet: bool = True, start_method: str = "spawn"):
+        self.workers = workers or available_cpus()
+        self.shard_size = shard_size
+        self.max_pending = max_pending or self.workers * 2
+        # spawn, not fork: forking a parent that already started torch/OpenMP threads can deadlock
+        context = mp.get_context(start_method)
+        self.pool = context.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(model_path, batch_size, torch_threads, quiet),
+        )
+
+    def shards(self, pairs: Iterable[Tuple[str, str]]) -> Iterator[List[Tuple[str, str]]]:
+        """Split pairs into lists of `shard_size` without materializing the input"""
+        iterator = iter(pairs)
+        while True:
+            shard = list(islice(iterator, self.shard_size))
+            if not shard:
+                return
+            yield shard
+
+    def imap(self, pairs: Iterable[Tuple[str, str]]) -> Iterator[Dict]:
+        """Yield one report per pair, in input order, as shards finish"""
+        pending = deque()
+        for shard in self.shards(pairs):
+            pending.append(self.pool.apply_async(_compare_shard, (shard,)))
+            if len(pending) >= self.max_pending:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+    def compare_many(self, pairs: Iterable[Tuple[str, str]]) -> List[Dict]:
+        """Compare all pairs across the pool; same result as `EnhancedProductComparator.compare_many`"""
+        return list(self.imap(pairs))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.pool.terminate()
+            self.pool.join()
+        else:
+            self.close()
+
+
+def compare_parallel(pairs: Iterable[Tuple[str, str]], workers: Optional[int] = None, **kwargs) -> List[Dict]:
+    """One-shot helper: compare `pairs` on a temporary pool of `workers` processes"""
+    with ParallelComparisonRunner(workers, **kwargs) as runner:
+        return runner.compare_many(pairs)
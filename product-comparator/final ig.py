@@ -1,6 +1,6 @@
 
-import re
 from prettytable import PrettyTable
+from rule_engine import RuleEngine
 
 
 FIELD_RULES = {
@@ -82,15 +82,13 @@ ASPECT_ORDER = {
 
 # Helper Functions
 
+RULE_ENGINE = RuleEngine(FIELD_RULES)
+
 def extract_details(text):
-    result = {}
-    for field, rules in FIELD_RULES.items():
-        for pattern, formatter in rules:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                result[field] = formatter(match)
-                break
-    return result
+    return RULE_ENGINE.extract_details(text)
+
+def extract_details_many(texts):
+    return RULE_ENGINE.extract_details_many(texts)
 
 def compare_strings(s1, s2, pair_num):
     d1 = extract_details(s1)
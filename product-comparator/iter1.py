@@ -1,5 +1,5 @@
-import re
 from prettytable import PrettyTable
+from rule_engine import RuleEngine
 
 # -----------------------------
 # Regex-Based Field Extraction Rules
@@ -85,15 +85,13 @@ GENERIC_ASPECT_ORDER = [
 # Helper Functions (Unchanged)
 # -----------------------------
 
+RULE_ENGINE = RuleEngine(FIELD_RULES)
+
 def extract_details(text):
-    result = {}
-    for field, rules in FIELD_RULES.items():
-        for pattern, formatter in rules:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                result[field] = formatter(match)
-                break
-    return result
+    return RULE_ENGINE.extract_details(text)
+
+def extract_details_many(texts):
+    return RULE_ENGINE.extract_details_many(texts)
 
 def compare_strings(s1, s2, pair_num=None, aspect_order=None):
     d1 = extract_details(s1)
@@ -0,0 +1,121 @@
+import json
+import os
+from collections import deque, namedtuple
+
+# -----------------------------
+# Aho-Corasick Keyword Matcher
+# Builds one automaton over every keyword in the vocabulary, then finds all
+# material / form / brand keywords in a single left-to-right pass over the
+# text, so the cost per description does not grow with the vocabulary size
+# -----------------------------
+
+VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vocabulary.json")
+
+KeywordMatch = namedtuple("KeywordMatch", ["start", "end", "keyword", "category", "label"])
+
+
+class KeywordMatcher:
+    def __init__(self, whole_words=False):
+        # whole_words=False matches inside longer words too, like `"bag" in text`
+        self.whole_words = whole_words
+        self.goto = [{}]
+        self.fail = [0]
+        # Keywords ending at each node; `output` adds those reachable through failure links
+        self.keywords = [[]]
+        self.output = [[]]
+        # (category, label) -> rank; a lower rank wins when several labels match
+        self.priority = {}
+        self.keyword_count = 0
+        self._built = True
+
+    @classmethod
+    def from_vocabulary(cls, path=VOCABULARY_PATH, whole_words=False):
+        """Vocabulary file: {category: {label: [keywords]}}, labels listed in priority order"""
+        with open(path, encoding="utf-8") as f:
+            vocabulary = json.load(f)
+        matcher = cls(whole_words=whole_words)
+        for category, labels in vocabulary.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    matcher.add(keyword, category, label)
+        matcher.build()
+        return matcher
+
+    def add(self, keyword, category, label):
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.keywords.append([])
+                self.output.append([])
+            node = next_node
+        self.keywords[node].append((keyword, category, label))
+        self.priority.setdefault((category, label), len(self.priority))
+        self.keyword_count += 1
+        self._built = False
+
+    def build(self):
+        # Breadth-first failure links; each node also inherits the outputs of its failure node
+        queue = deque()
+        for next_node in self.goto[0].values():
+            self.fail[next_node] = 0
+            self.output[next_node] = list(self.keywords[next_node])
+            queue.append(next_node)
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.goto[node].items():
+                queue.append(next_node)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_node] = self.goto[fallback].get(char, 0)
+                self.output[next_node] = self.keywords[next_node] + self.output[self.fail[next_node]]
+        self._built = True
+        return self
+
+    def _is_word(self, text, start, end):
+        before = start == 0 or not text[start - 1].isalnum()
+        after = end == len(text) or not text[end].isalnum()
+        return before and after
+
+    def find_all(self, text):
+        """Every keyword occurrence in `text` (case-insensitive), ordered by end position"""
+        if not self._built:
+            self.build()
+        goto, fail, output = self.goto, self.fail, self.output
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            lowered = char.lower()
+            char = lowered if len(lowered) == 1 else char
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword, category, label in output[node]:
+                end = position + 1
+                start = end - len(keyword)
+                if self.whole_words and not self._is_word(text, start, end):
+                    continue
+                matches.append(KeywordMatch(start, end, keyword, category, label))
+        return matches
+
+    def labels(self, text):
+        """{category: highest-priority label found} from one pass over `text`"""
+        best = {}
+        for match in self.find_all(text):
+            rank = self.priority[(match.category, match.label)]
+            current = best.get(match.category)
+            if current is None or rank < current[0]:
+                best[match.category] = (rank, match.label)
+        return {category: label for category, (_, label) in best.items()}
+
+    def first(self, text, category):
+        """Best label of one category, or None"""
+        return self.labels(text).get(category)
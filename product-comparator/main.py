@@ -7,7 +7,9 @@ from rapidfuzz import fuzz
 from prettytable import PrettyTable
 from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
+from keyword_matcher import KeywordMatcher
 
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -31,23 +33,18 @@ def extract_diameter(text):
     match = re.search(r"(\d{1,3}\.?\d*)\s?mm", text)
     return f"{float(match.group(1)):.2f} mm" if match else None
 
+# Material / form / brand keywords from vocabulary.json, all found in one pass
+KEYWORDS = KeywordMatcher.from_vocabulary()
+
+@lru_cache(maxsize=1024)
+def keyword_labels(text):
+    return KEYWORDS.labels(text)
+
 def extract_material(text):
-    if "opc" in text:
-        return "OPC"
-    if "tmt" in text:
-        return "TMT"
-    if "strand" in text or "lrpc" in text:
-        return "PC Strand"
-    return None
+    return keyword_labels(text).get("material")
 
 def extract_form(text):
-    if "bulk" in text or "loose" in text:
-        return "Loose"
-    if "straight" in text:
-        return "Straight bars"
-    if "bag" in text:
-        return "Bag"
-    return None
+    return keyword_labels(text).get("form")
 
 def extract_length(text):
     match = re.search(r"(\d{4,5}\.?\d*)\s?mm", text)
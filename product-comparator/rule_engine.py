@@ -0,0 +1,50 @@
+import re
+
+# -----------------------------
+# Compiled FIELD_RULES Engine
+# Precompiles every (pattern, formatter) rule once; per field the first
+# matching rule wins and the remaining rules are skipped
+# -----------------------------
+
+DEFAULT_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+class RuleEngine:
+    def __init__(self, field_rules, flags=DEFAULT_FLAGS):
+        self.field_rules = field_rules
+        self.rules = [
+            (field, [(re.compile(pattern, flags).search, formatter) for pattern, formatter in rules])
+            for field, rules in field_rules.items()
+        ]
+        self.rule_count = sum(len(rules) for _, rules in self.rules)
+
+    def extract_details(self, text):
+        result = {}
+        for field, rules in self.rules:
+            for search, formatter in rules:
+                match = search(text)
+                if match:
+                    result[field] = formatter(match)
+                    break
+        return result
+
+    def extract_details_many(self, texts):
+        # Repeated descriptions (same SKU on many lines) are only extracted once
+        seen = {}
+        results = []
+        for text in texts:
+            details = seen.get(text)
+            if details is None:
+                details = seen[text] = self.extract_details(text)
+            results.append(dict(details))
+        return results
+
+    def rules_evaluated(self, text):
+        # Number of rule searches extract_details performs on `text`
+        count = 0
+        for _, rules in self.rules:
+            for search, _ in rules:
+                count += 1
+                if search(text):
+                    break
+        return count
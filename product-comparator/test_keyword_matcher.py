@@ -0,0 +1,72 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from keyword_matcher import KeywordMatcher
+
+# -----------------------------
+# Keyword Matcher Tests
+# Pins what main.py's extract_material / extract_form return (they read
+# `labels(text)` from this vocabulary) against the original if-chains
+# -----------------------------
+
+KEYWORDS = KeywordMatcher.from_vocabulary()
+
+
+def old_material(text):
+    if "opc" in text:
+        return "OPC"
+    if "tmt" in text:
+        return "TMT"
+    if "strand" in text or "lrpc" in text:
+        return "PC Strand"
+    return None
+
+
+def old_form(text):
+    if "bulk" in text or "loose" in text:
+        return "Loose"
+    if "straight" in text:
+        return "Straight bars"
+    if "bag" in text:
+        return "Bag"
+    return None
+
+
+SAMPLES = [
+    "opc 53 loose",
+    "opc43looseloose cement",
+    "tmt fe500d 12mm straight bars",
+    "s_lrpcf bis 14268_2022 grade_1860-p 15.20mm oiled.",
+    "ht steel strand; nominal diameter of strand :- 12.7 mm;",
+    "opc 43 bag",
+    "tmt fe550d coil",
+    "tmt fe500d 16mm bundle",
+    "bulk tmt in bags",
+    "rib bar 12 mm",
+]
+
+
+def test_matches_original_chains():
+    for text in SAMPLES:
+        labels = KEYWORDS.labels(text)
+        assert labels.get("material") == old_material(text), text
+        assert labels.get("form") == old_form(text), text
+    print("✅ Material and form labels match the original if-chains")
+
+
+def test_vocabulary_additions():
+    # Full forms and brands added with the vocabulary; none of them changes an existing label
+    assert KEYWORDS.labels("ordinary portland cement 53 grade").get("material") == "OPC"
+    assert KEYWORDS.labels("thermo-mechanically treated bars").get("material") == "TMT"
+    assert KEYWORDS.labels("tata tiscon tmt fe500d").get("brand") == "Tata Tiscon"
+    # Coil and bundle are not form labels: extract_form leaves them unset as before
+    assert KEYWORDS.labels("tmt fe550d coil").get("form") is None
+    assert KEYWORDS.labels("tmt fe500d bundle").get("form") is None
+    print("✅ Vocabulary additions behave as documented")
+
+
+if __name__ == "__main__":
+    test_matches_original_chains()
+    test_vocabulary_additions()
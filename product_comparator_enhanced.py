@@ -1,29 +1,94 @@
-import spacy
-import re
-import requests
 from rapidfuzz import fuzz
-from prettytable import PrettyTable
-from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
 import os
 import json
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, TextIO
 import numpy as np
+from concurrent.futures import Future
+from batch_scheduler import MicroBatchScheduler, SchedulerClosed, SchedulerFull
+from embedding_cache import EmbeddingCache
+from llm_client import GroqClient, LLM_FIELD_HINTS, build_batch_prompt, field_list, parse_batch_response
+from llm_cache import LLMResultCache, prompt_template_hash
+from regex_engine import RegexExtractionEngine
+from units import is_numeric_field, lengths_match, parse_length
+from canonical import Canonicalizer
+from field_cascade import FieldCascade, LLMTier
+from structured_parser import StructuredParser
+from instrumentation import Instrumentation
+from reporting import INFO, Reporter
+
+if TYPE_CHECKING:
+    import spacy
 
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+SEMANTIC_MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
 
 # ---
 # ENHANCED PRODUCT COMPARATOR
-# Combines multiple extraction methods with confidence scoring
+# Combines multiple extraction methods with confidence scoring.
+# spaCy and sentence_transformers (torch) are imported and loaded on first use,
+# so importing this module and regex/exact-match work stay fast.
 # ---
 
+def _resolved(value) -> Future:
+    """A future that is already done, for results served from a cache"""
+    future = Future()
+    future.set_result(value)
+    return future
+
+def _chain(future: Future, fn) -> Future:
+    """A future for `fn(future.result())`, computed when `future` finishes"""
+    chained = Future()
+    def done(finished):
+        try:
+            chained.set_result(fn(finished.result()))
+        except Exception as e:
+            chained.set_exception(e)
+    future.add_done_callback(done)
+    return chained
+
+def _cosine(emb1, emb2) -> float:
+    """Cosine similarity of two vectors"""
+    emb1 = np.asarray(emb1, dtype=np.float32).ravel()
+    emb2 = np.asarray(emb2, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(emb1) * np.linalg.norm(emb2))
+    return float(np.dot(emb1, emb2)) / norm if norm else 0.0
+
+# Lowercase field name -> the one key merged entities and structured records use ("Grade", ...)
+FIELD_NAMES = {field.lower(): field for field in LLM_FIELD_HINTS}
+
 class EnhancedProductComparator:
-    def __init__(self, model_path="ner_model_improved"):
-        """Initialize the enhanced comparator with all components"""
-        self.nlp = self.load_ner_model(model_path)
-        self.semantic_model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+    def __init__(self, model_path="ner_model_improved", embedding_cache: Optional[EmbeddingCache] = None,
+                 llm_client: Optional[GroqClient] = None, llm_cache: Optional[LLMResultCache] = None,
+                 warmup: bool = False):
+        """Initialize the enhanced comparator; models load on first use (or in the background with `warmup`)"""
+        self.model_path = model_path
+        self._nlp = None
+        self._semantic_model = None
+        self._nlp_lock = threading.Lock()
+        self._semantic_lock = threading.Lock()
+        self._warmup_thread = None
+        self.ner_scheduler: Optional[MicroBatchScheduler] = None
+        self.encode_scheduler: Optional[MicroBatchScheduler] = None
+        self.embedding_cache = embedding_cache or EmbeddingCache(SEMANTIC_MODEL_NAME, cache_dir=EMBEDDING_CACHE_DIR)
+        self.llm_client = llm_client or (GroqClient(GROQ_API_KEY) if GROQ_API_KEY else None)
+        self.llm_cache = llm_cache or (LLMResultCache(LLM_CACHE_PATH) if LLM_CACHE_PATH else None)
+        self._llm_templates = {}
         self.confidence_threshold = 0.7
+        self.llm_batch_size = 10
+        self.llm_batch_retries = 2
+        self.fuzzy_threshold = 0.85
+        self.semantic_threshold = 0.8
+        self.numeric_rel_tol = 1e-3
+        self.numeric_abs_tol = 0.01  # mm
+        self.canonicalizer = Canonicalizer()
+        self.cascade = FieldCascade.default(self)
+        self.instrumentation: Optional[Instrumentation] = None
+        self.reporter = Reporter()
         
         # Regex patterns for different fields
         self.patterns = {
@@ -46,25 +111,150 @@ class EnhancedProductComparator:
                 r'bs\s+\d+'
             ]
         }
+        self.regex_engine = RegexExtractionEngine(self.patterns)
+        self.structured_parser = StructuredParser(self.canonicalizer)
+        if warmup:
+            self.warmup()
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access"""
+        if self._nlp is None:
+            with self._nlp_lock:
+                if self._nlp is None:
+                    self._nlp = self.load_ner_model(self.model_path)
+        return self._nlp
+    
+    @nlp.setter
+    def nlp(self, nlp):
+        self._nlp = nlp
+    
+    @property
+    def semantic_model(self):
+        """SentenceTransformer, loaded on first access"""
+        if self._semantic_model is None:
+            with self._semantic_lock:
+                if self._semantic_model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._semantic_model = SentenceTransformer(SEMANTIC_MODEL_NAME)
+        return self._semantic_model
+    
+    @semantic_model.setter
+    def semantic_model(self, model):
+        self._semantic_model = model
+    
+    def models_loaded(self) -> Dict[str, bool]:
+        """Which of the lazy models have been loaded so far"""
+        return {"nlp": self._nlp is not None, "semantic_model": self._semantic_model is not None}
+    
+    def warmup(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load both models now, by default on a daemon thread so startup is not blocked
+
+        Callers that reach a model before the thread is done simply wait on its lock.
+        """
+        def load():
+            self.nlp
+            self.semantic_model
+        if not background:
+            load()
+            return None
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=load, name="comparator-warmup", daemon=True)
+            self._warmup_thread.start()
+        return self._warmup_thread
+    
+    def enable_micro_batching(self, max_batch_size: int = 32, max_latency_ms: float = 5,
+                              max_queue: int = 4096) -> "EnhancedProductComparator":
+        """Share NER and encode calls from concurrent callers through micro-batches
+
+        Single-text `nlp(text)` and small `encode` calls made from many threads
+        (e.g. parallel `compare_products`) are collected for up to
+        `max_latency_ms` or `max_batch_size` items and run as one `nlp.pipe`
+        and one `encode` call.
+        """
+        if self.ner_scheduler is None:
+            self.ner_scheduler = MicroBatchScheduler(
+                lambda texts: list(self.nlp.pipe(texts, batch_size=max_batch_size)),
+                max_batch_size, max_latency_ms, max_queue, name="ner-batch",
+            )
+            self.encode_scheduler = MicroBatchScheduler(
+                lambda values: list(self.semantic_model.encode(values, batch_size=max_batch_size)),
+                max_batch_size, max_latency_ms, max_queue, name="encode-batch",
+            )
+        return self
+    
+    def disable_micro_batching(self):
+        """Stop the schedulers; later calls go straight to the models again"""
+        schedulers = (self.ner_scheduler, self.encode_scheduler)
+        self.ner_scheduler = self.encode_scheduler = None
+        for scheduler in schedulers:
+            if scheduler is not None:
+                scheduler.close()
+    
+    def batching_stats(self) -> Dict:
+        """Queue-depth and batch-size histograms of the NER and encode schedulers"""
+        if self.ner_scheduler is None:
+            return {}
+        return {"ner": self.ner_scheduler.stats(), "encode": self.encode_scheduler.stats()}
+    
+    def enable_instrumentation(self, stages: Optional[List[str]] = None) -> Instrumentation:
+        """Time every hot-path stage (see instrumentation.DEFAULT_STAGES) until disabled"""
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation(stages) if stages else Instrumentation()
+        return self.instrumentation.attach(self)
+    
+    def disable_instrumentation(self):
+        """Remove the stage timers; the last collected stats stay on `self.instrumentation`"""
+        if self.instrumentation is not None:
+            self.instrumentation.detach()
+    
+    def parse(self, text: str):
+        """Run the NER pipeline on one text, through the micro-batcher when enabled
+
+        A full or closed micro-batcher falls back to a direct call instead of failing the text.
+        """
+        scheduler = self.ner_scheduler
+        if scheduler is not None:
+            try:
+                return scheduler(text)
+            except (SchedulerFull, SchedulerClosed):
+                pass
+        return self.nlp(text)
+    
+    def encode(self, values: List[str], batch_size: int = 32) -> np.ndarray:
+        """Embed values with the semantic model, through the micro-batcher when enabled
+
+        A full or closed micro-batcher falls back to a direct call, so callers such as
+        semantic_similarity never mistake backpressure for a zero similarity.
+        """
+        scheduler = self.encode_scheduler
+        if scheduler is not None:
+            try:
+                return np.asarray(scheduler.map(values))
+            except (SchedulerFull, SchedulerClosed):
+                pass
+        return self.semantic_model.encode(values, batch_size=batch_size)
     
-    def load_ner_model(self, model_path: str) -> spacy.language.Language:
+    def load_ner_model(self, model_path: str) -> "spacy.language.Language":
         """Load NER model with fallback options"""
+        import spacy
         try:
             return spacy.load(model_path)
         except OSError:
-            print(f"⚠️  Model not found at {model_path}, trying alternatives...")
+            self.reporter.warning(f"⚠️  Model not found at {model_path}, trying alternatives...")
             alternatives = ["ner_model", "en_core_web_sm", "en_core_web_md"]
             for alt in alternatives:
                 try:
                     return spacy.load(alt)
                 except OSError:
                     continue
-            print("❌ No NER models found. Using blank model.")
+            self.reporter.warning("❌ No NER models found. Using blank model.")
             return spacy.blank("en")
     
-    def extract_with_ner(self, text: str) -> Dict[str, List[Tuple[str, float]]]:
-        """Extract entities using NER with confidence scores"""
-        doc = self.nlp(text)
+    def extract_with_ner(self, text: str, doc=None) -> Dict[str, List[Tuple[str, float]]]:
+        """Extract entities using NER with confidence scores (reuses `doc` if already parsed)"""
+        if doc is None:
+            doc = self.parse(text)
         entities = {}
         
         for ent in doc.ents:
@@ -77,71 +267,190 @@ class EnhancedProductComparator:
         return entities
     
     def extract_with_regex(self, text: str) -> Dict[str, List[Tuple[str, float]]]:
-        """Extract entities using regex patterns"""
-        entities = {}
-        text_lower = text.lower()
-        
-        for field, patterns in self.patterns.items():
-            entities[field] = []
-            for pattern in patterns:
-                matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-                for match in matches:
-                    # Higher confidence for longer matches
-                    confidence = min(0.8, 0.4 + (len(match.group()) / 10))
-                    entities[field].append((match.group(), confidence))
-        
-        return entities
+        """Extract entities using the precompiled regex patterns"""
+        return self.regex_engine.extract(text)
     
-    def extract_with_llm(self, text: str) -> Dict[str, List[Tuple[str, float]]]:
-        """Extract entities using LLM fallback"""
-        if not GROQ_API_KEY:
-            return {}
-        
-        prompt = f"""
+    def build_llm_prompt(self, text: str, fields: Optional[List[str]] = None) -> str:
+        """Prompt asking the LLM for `fields` (all fields by default) of one description"""
+        return f"""
 Extract the following fields from this product description. Return as JSON:
-- Material (e.g., TMT, OPC, PC Strand)
-- Grade (e.g., Fe500, OPC 43, Class I)
-- Diameter (in mm)
-- Length (in mm)
-- Form (e.g., Loose, Bag, Coil)
-- Standard (e.g., IS 1786, ASTM)
+{field_list(fields)}
 
 Text: {text}
 
 Return only the JSON object, no other text.
 """
+    
+    def missing_fields(self, *extractions: Dict) -> List[str]:
+        """LLM fields that no local extraction found with confidence above the threshold"""
+        best = {}
+        for entities in extractions:
+            for field, values in entities.items():
+                for _, confidence in values:
+                    best[field.lower()] = max(best.get(field.lower(), 0.0), confidence)
+        return [field for field in LLM_FIELD_HINTS if best.get(field.lower(), 0.0) < self.confidence_threshold]
+    
+    def extract_local(self, text: str, doc=None) -> Tuple[Dict, Dict]:
+        """Regex first, then NER only if regex left fields missing; returns (ner, regex)"""
+        regex_entities = self.extract_with_regex(text)
+        if doc is None and not self.missing_fields(regex_entities):
+            return {}, regex_entities
+        return self.extract_with_ner(text, doc=doc), regex_entities
+    
+    def parse_llm_response(self, result: str) -> Dict[str, List[Tuple[str, float]]]:
+        """Turn the LLM's JSON answer into scored entities"""
+        return self.llm_entities(self._parse_llm_data(result))
+    
+    def _parse_llm_data(self, result: str) -> Optional[Dict]:
+        """Raw field values from the LLM's JSON answer, or None if it is not a JSON object"""
+        try:
+            data = json.loads(result)
+        except json.JSONDecodeError:
+            return None
+        return data if isinstance(data, dict) else None
+    
+    def llm_entities(self, data: Optional[Dict], fields: Optional[List[str]] = None) -> Dict[str, List[Tuple[str, float]]]:
+        """Score the field values the LLM returned for one description, keeping only `fields` if given"""
+        entities = {}
+        for field, value in (data or {}).items():
+            if fields is not None and field not in fields:
+                continue
+            if value and str(value).lower() not in ['unknown', 'none', '']:
+                # Ensure value is a string
+                str_value = str(value)
+                entities[field] = [(str_value, 0.6)]  # Lower confidence for LLM
+        return entities
+    
+    def _llm_cache_key(self, text: str, template_hash: str) -> str:
+        """Cache key for one description under the current model and prompt"""
+        return LLMResultCache.key(text, self.llm_client.model, template_hash)
+    
+    def _llm_template(self, fields: Optional[List[str]], batch: bool = False) -> str:
+        """Fingerprint of the prompt template asking for `fields`"""
+        key = (tuple(fields) if fields is not None else None, batch)
+        if key not in self._llm_templates:
+            template = build_batch_prompt(["{text}"], fields) if batch else self.build_llm_prompt("{text}", fields)
+            self._llm_templates[key] = prompt_template_hash(template)
+        return self._llm_templates[key]
+    
+    def _cache_llm_data(self, keys: List[str], data: List[Optional[Dict]]):
+        """Persist parsed LLM answers; unparseable ones are not cached"""
+        if self.llm_cache is not None:
+            self.llm_cache.put_many([(key, value) for key, value in zip(keys, data) if value is not None])
+    
+    def submit_llm(self, text: str, fields: Optional[List[str]] = None) -> Optional[Future]:
+        """Start an LLM extraction of `fields` in the background; pass the result to `collect_llm`
+
+        The future resolves to the raw field values (or None). Cached texts never
+        reach the network, and an empty `fields` list skips the LLM entirely.
+        """
+        if self.llm_client is None or fields == []:
+            return None
+        key = self._llm_cache_key(text, self._llm_template(fields))
+        if self.llm_cache is not None:
+            cached = self.llm_cache.get(key)
+            if cached is not None:
+                return _resolved(cached)
         
+        def parse(result: str) -> Optional[Dict]:
+            data = self._parse_llm_data(result)
+            self._cache_llm_data([key], [data])
+            return data
+        return _chain(self.llm_client.submit(self.build_llm_prompt(text, fields)), parse)
+    
+    def collect_llm(self, future: Optional[Future], fields: Optional[List[str]] = None) -> Dict[str, List[Tuple[str, float]]]:
+        """Wait for a background LLM extraction and score it"""
+        if future is None:
+            return {}
         try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={"Authorization": f"Bearer {GROQ_API_KEY}"},
-                json={
-                    "model": "llama3-70b-8192",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.1
-                },
-                timeout=10
-            )
-            
-            result = response.json()["choices"][0]["message"]["content"].strip()
-            
-            # Try to parse JSON
-            try:
-                data = json.loads(result)
-                entities = {}
-                for field, value in data.items():
-                    if value and str(value).lower() not in ['unknown', 'none', '']:
-                        # Ensure value is a string
-                        str_value = str(value)
-                        entities[field] = [(str_value, 0.6)]  # Lower confidence for LLM
-                return entities
-            except json.JSONDecodeError:
-                return {}
-                
+            return self.llm_entities(future.result(), fields)
         except Exception as e:
-            print(f"LLM extraction failed: {e}")
+            self.reporter.warning(f"LLM extraction failed: {e}")
             return {}
     
+    def extract_with_llm(self, text: str, fields: Optional[List[str]] = None) -> Dict[str, List[Tuple[str, float]]]:
+        """Extract entities using LLM fallback"""
+        return self.collect_llm(self.submit_llm(text, fields), fields)
+    
+    def _submit_llm_chunks(self, texts: List[str], indices: List[int],
+                           fields: List[Optional[List[str]]]) -> List[Tuple[List[int], Future]]:
+        """Send `indices` of `texts` as prompts of `llm_batch_size` descriptions each
+
+        Texts are grouped by the fields they still need, so every prompt asks only
+        for those. Each future resolves to {position in chunk: raw field values}.
+        """
+        groups = {}
+        for i in indices:
+            if fields[i] != []:
+                groups.setdefault(tuple(fields[i]) if fields[i] is not None else None, []).append(i)
+        
+        submitted = []
+        for group_fields, group in groups.items():
+            group_fields = list(group_fields) if group_fields is not None else None
+            template = self._llm_template(group_fields, batch=True)
+            if self.llm_cache is not None:
+                keys = {i: self._llm_cache_key(texts[i], template) for i in group}
+                cached = self.llm_cache.get_many(list(dict.fromkeys(keys.values())))
+                hits = [i for i in group if keys[i] in cached]
+                if hits:
+                    submitted.append((hits, _resolved({pos: cached[keys[i]] for pos, i in enumerate(hits)})))
+                    group = [i for i in group if keys[i] not in cached]
+            
+            size = self.llm_batch_size
+            for start in range(0, len(group), size):
+                chunk = group[start:start + size]
+                chunk_texts = [texts[i] for i in chunk]
+                
+                def parse(result: str, chunk_texts=chunk_texts, template=template) -> Dict[int, Dict]:
+                    parsed = parse_batch_response(result, len(chunk_texts))
+                    self._cache_llm_data(
+                        [self._llm_cache_key(chunk_texts[pos], template) for pos in parsed],
+                        list(parsed.values())
+                    )
+                    return parsed
+                prompt = build_batch_prompt(chunk_texts, group_fields)
+                submitted.append((chunk, _chain(self.llm_client.submit(prompt), parse)))
+        return submitted
+    
+    def submit_llm_batch(self, texts: List[str],
+                         fields: Optional[List[Optional[List[str]]]] = None) -> List[Tuple[List[int], Future]]:
+        """Start batched LLM extractions in the background; pass the result to `collect_llm_batch`
+
+        `fields[i]` lists the fields to ask for text i (None for all, [] to skip it).
+        """
+        if self.llm_client is None:
+            return []
+        fields = fields if fields is not None else [None] * len(texts)
+        return self._submit_llm_chunks(texts, list(range(len(texts))), fields)
+    
+    def collect_llm_batch(self, texts: List[str], submitted: List[Tuple[List[int], Future]],
+                          fields: Optional[List[Optional[List[str]]]] = None) -> List[Dict]:
+        """Split batched answers back per text, re-asking only for descriptions that did not parse"""
+        fields = fields if fields is not None else [None] * len(texts)
+        results = [{} for _ in texts]
+        for attempt in range(self.llm_batch_retries + 1):
+            failed = []
+            for chunk, future in submitted:
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    self.reporter.warning(f"LLM batch extraction failed: {e}")
+                    parsed = {}
+                for position, index in enumerate(chunk):
+                    if position in parsed:
+                        results[index] = self.llm_entities(parsed[position], fields[index])
+                    else:
+                        failed.append(index)
+            if not failed or attempt == self.llm_batch_retries:
+                break
+            submitted = self._submit_llm_chunks(texts, failed, fields)
+        return results
+    
+    def extract_with_llm_batch(self, texts: List[str],
+                               fields: Optional[List[Optional[List[str]]]] = None) -> List[Dict[str, List[Tuple[str, float]]]]:
+        """Extract entities for many texts with one LLM round trip per `llm_batch_size` texts"""
+        return self.collect_llm_batch(texts, self.submit_llm_batch(texts, fields), fields)
+    
     def merge_extractions(self, ner_entities: Dict, regex_entities: Dict, llm_entities: Dict) -> Dict[str, str]:
         """Merge extractions from different methods with confidence scoring"""
         merged = {}
@@ -150,12 +459,15 @@ Return only the JSON object, no other text.
         all_entities = {}
         for method, entities in [('ner', ner_entities), ('regex', regex_entities), ('llm', llm_entities)]:
             for field, values in entities.items():
+                # Regex keys are lowercase; candidates from every method compete under one key
+                field = FIELD_NAMES.get(field.lower(), field)
                 if field not in all_entities:
                     all_entities[field] = []
                 for value, confidence in values:
                     all_entities[field].append((value, confidence, method))
         
         # Select best extraction for each field
+        verbose = self.reporter.enabled(INFO)
         for field, candidates in all_entities.items():
             if not candidates:
                 continue
@@ -167,72 +479,204 @@ Return only the JSON object, no other text.
             # Only use if confidence is above threshold
             if best_confidence >= self.confidence_threshold:
                 merged[field] = best_value
-                print(f"  {field}: {best_value} (confidence: {best_confidence:.2f}, method: {best_method})")
-            else:
-                print(f"  {field}: Skipped (confidence: {best_confidence:.2f} < {self.confidence_threshold})")
+                if verbose:
+                    self.reporter.info(f"  {field}: {best_value} (confidence: {best_confidence:.2f}, method: {best_method})")
+            elif verbose:
+                self.reporter.info(f"  {field}: Skipped (confidence: {best_confidence:.2f} < {self.confidence_threshold})")
         
         return merged
     
-    def semantic_similarity(self, val1: str, val2: str) -> float:
-        """Calculate semantic similarity between two values"""
+    def semantic_similarity(self, val1: str, val2: str, embeddings: Optional[Dict] = None) -> float:
+        """Calculate semantic similarity between two values
+
+        `embeddings` maps values to vectors that were already encoded in a batch;
+        values missing from it are encoded on the spot.
+        """
         if not val1 or not val2:
             return 0.0
         
         try:
-            emb1 = self.semantic_model.encode(val1, convert_to_tensor=True)
-            emb2 = self.semantic_model.encode(val2, convert_to_tensor=True)
-            similarity = util.cos_sim(emb1, emb2)
-            return similarity.item()
+            embeddings = embeddings or {}
+            emb1 = embeddings.get(val1)
+            emb2 = embeddings.get(val2)
+            if emb1 is None or emb2 is None:
+                emb1, emb2 = self.embedding_cache.encode([val1, val2], self.encode)
+            return _cosine(emb1, emb2)
         except Exception:
             return 0.0
     
-    def compare_field(self, val1: str, val2: str) -> Tuple[str, str, str, float]:
-        """Compare two field values with confidence score"""
-        if not val1 and not val2:
-            return ("⚪ Not Mentioned", val1, val2, 1.0)
-        elif val1 == val2:
-            return ("✅ Exact Match", val1, val2, 1.0)
-        elif val1 and val2:
-            # Try fuzzy matching
-            fuzzy_ratio = fuzz.ratio(val1.lower(), val2.lower()) / 100
-            if fuzzy_ratio > 0.85:
-                return ("✅ Fuzzy Match", val1, val2, fuzzy_ratio)
-            
-            # Try semantic similarity
-            semantic_sim = self.semantic_similarity(val1, val2)
-            if semantic_sim > 0.8:
-                return ("✅ Semantic Match", val1, val2, semantic_sim)
-        
+    def encode_values(self, values: List[str], batch_size: int = 32) -> Dict:
+        """Encode distinct field values, sending only cache misses to the model in one batched call"""
+        values = list(dict.fromkeys(v for v in values if v))
+        if not values:
+            return {}
+        vectors = self.embedding_cache.encode(
+            values, lambda batch: self.encode(batch, batch_size=batch_size)
+        )
+        return dict(zip(values, vectors))
+    
+    def fuzzy_ratio(self, val1: str, val2: str) -> float:
+        """Normalized fuzzy ratio used by the fuzzy matching step"""
+        return fuzz.ratio(val1.lower(), val2.lower()) / 100
+    
+    def compare_numeric(self, val1: str, val2: str, field: Optional[str]) -> Optional[Tuple[str, str, str, float]]:
+        """Unit-aware result for Diameter/Length values that both parse as lengths, else None"""
+        if not is_numeric_field(field):
+            return None
+        mm1, mm2 = parse_length(val1), parse_length(val2)
+        if mm1 is None or mm2 is None:
+            return None
+        if lengths_match(mm1, mm2, rel_tol=self.numeric_rel_tol, abs_tol=self.numeric_abs_tol):
+            return ("✅ Numeric Match", val1, val2, 1.0)
         return ("❌ Mismatch", val1, val2, 0.0)
     
+    def needs_embedding(self, val1: str, val2: str, field: Optional[str] = None) -> bool:
+        """Whether compare_field would reach the semantic tier for these values"""
+        return self.cascade.reaches("semantic", val1, val2, field)
+    
+    def enable_llm_tier(self, min_confidence: float = 0.8):
+        """Append an LLM tier after semantic matching for pairs no cheaper tier matched"""
+        if "llm" not in self.cascade.names():
+            self.cascade.add_tier(LLMTier(self, min_confidence=min_confidence))
+        return self
+    
+    def cascade_stats(self) -> Dict:
+        """Calls, hits and timing histograms of each compare_field tier"""
+        return self.cascade.stats()
+    
+    def compare_field(self, val1: str, val2: str, embeddings: Optional[Dict] = None,
+                      field: Optional[str] = None) -> Tuple[str, str, str, float]:
+        """Compare two field values with confidence score
+
+        Runs `self.cascade`: exact, canonical (Material/Grade/Form/Standard alias
+        tables), numeric (Diameter/Length in millimetres), fuzzy, semantic and,
+        after `enable_llm_tier()`, the LLM. The first tier that decides wins.
+        """
+        return self.cascade.compare(val1, val2, field, embeddings)
+    
+    def extract_structured(self, text: str) -> Optional[Dict[str, str]]:
+        """Entities of a "KEY :- value;" description, or None when it needs the full pipeline"""
+        return self.structured_parser.parse(text)
+    
+    def print_structured(self, entities: Dict[str, str]):
+        if self.reporter.enabled(INFO):
+            for field, value in entities.items():
+                self.reporter.info(f"  {field}: {value} (confidence: 1.00, method: structured)")
+    
     def compare_products(self, text1: str, text2: str) -> Dict:
         """Compare two product descriptions comprehensively"""
-        print(f"\n🔍 Comparing products...")
-        print(f"Product 1: {text1[:100]}...")
-        print(f"Product 2: {text2[:100]}...")
+        verbose = self.reporter.enabled(INFO)
+        if verbose:
+            self.reporter.info("\n🔍 Comparing products...")
+            self.reporter.info(f"Product 1: {text1[:100]}...")
+            self.reporter.info(f"Product 2: {text2[:100]}...")
+        
+        # Structured "KEY :- value;" descriptions skip NER, regex and the LLM
+        structured1 = self.extract_structured(text1)
+        structured2 = self.extract_structured(text2)
+        
+        # Cheap extractors first; the LLM is only asked for what they left uncertain
+        ner1, regex1 = self.extract_local(text1) if structured1 is None else ({}, {})
+        ner2, regex2 = self.extract_local(text2) if structured2 is None else ({}, {})
+        fields1 = self.missing_fields(ner1, regex1) if structured1 is None else []
+        fields2 = self.missing_fields(ner2, regex2) if structured2 is None else []
+        
+        # Both LLM calls (if any) run concurrently
+        llm_future1 = self.submit_llm(text1, fields1)
+        llm_future2 = self.submit_llm(text2, fields2)
         
-        # Extract entities using all methods
-        print("\n📊 Extracting entities from Product 1:")
-        ner1 = self.extract_with_ner(text1)
-        regex1 = self.extract_with_regex(text1)
-        llm1 = self.extract_with_llm(text1)
-        entities1 = self.merge_extractions(ner1, regex1, llm1)
+        self.reporter.info("\n📊 Extracting entities from Product 1:")
+        if structured1 is not None:
+            self.print_structured(structured1)
+            entities1 = structured1
+        else:
+            llm1 = self.collect_llm(llm_future1, fields1)
+            entities1 = self.merge_extractions(ner1, regex1, llm1)
         
-        print("\n📊 Extracting entities from Product 2:")
-        ner2 = self.extract_with_ner(text2)
-        regex2 = self.extract_with_regex(text2)
-        llm2 = self.extract_with_llm(text2)
-        entities2 = self.merge_extractions(ner2, regex2, llm2)
+        self.reporter.info("\n📊 Extracting entities from Product 2:")
+        if structured2 is not None:
+            self.print_structured(structured2)
+            entities2 = structured2
+        else:
+            llm2 = self.collect_llm(llm_future2, fields2)
+            entities2 = self.merge_extractions(ner2, regex2, llm2)
         
         # Compare fields
-        print("\n🔄 Comparing fields:")
+        self.reporter.info("\n🔄 Comparing fields:")
+        return self.build_report(text1, text2, entities1, entities2)
+    
+    def extract_many(self, texts: List[str], batch_size: int = 32) -> Dict[str, Dict[str, str]]:
+        """Extract merged entities for many texts with a single `nlp.pipe` pass, keyed by text"""
+        texts = list(dict.fromkeys(texts))
+        
+        # Structured descriptions are parsed directly; only the rest go through the pipeline
+        entities = {}
+        unstructured = []
+        for text in texts:
+            structured = self.extract_structured(text)
+            if structured is not None:
+                entities[text] = structured
+            else:
+                unstructured.append(text)
+        texts = unstructured
+        
+        # Regex everything, then one NER pass over the texts regex did not fully cover
+        regex_results = [self.extract_with_regex(text) for text in texts]
+        ner_results = [{} for _ in texts]
+        needs_ner = [i for i, regex_entities in enumerate(regex_results) if self.missing_fields(regex_entities)]
+        if needs_ner:
+            docs = self.nlp.pipe([texts[i] for i in needs_ner], batch_size=batch_size)
+            for i, doc in zip(needs_ner, docs):
+                ner_results[i] = self.extract_with_ner(texts[i], doc=doc)
+        
+        # Batched LLM prompts only for the fields still missing
+        fields = [self.missing_fields(ner, regex) for ner, regex in zip(ner_results, regex_results)]
+        llm_results = self.extract_with_llm_batch(texts, fields)
+        
+        for text, ner_entities, regex_entities, llm_entities in zip(texts, ner_results, regex_results, llm_results):
+            entities[text] = self.merge_extractions(ner_entities, regex_entities, llm_entities)
+        return entities
+    
+    def compare_many(self, pairs: List[Tuple[str, str]], batch_size: int = 32) -> List[Dict]:
+        """Compare many product pairs, batching NER and embedding work across the whole set
+
+        Every distinct text goes through `nlp.pipe` once and every distinct field value
+        that reaches the semantic step is encoded in a single `encode` call. Returns one
+        report per pair, in input order, in the same shape as `compare_products`.
+        """
+        pairs = list(pairs)
+        entities = self.extract_many([text for pair in pairs for text in pair], batch_size=batch_size)
+        return self.compare_extracted(pairs, entities, batch_size=batch_size)
+    
+    def compare_extracted(self, pairs: List[Tuple[str, str]], entities: Dict[str, Dict[str, str]],
+                          batch_size: int = 32) -> List[Dict]:
+        """Build reports for `pairs` from entities already returned by `extract_many`"""
+        # Only values that fall through exact, numeric and fuzzy matching need an embedding
+        pending = []
+        for text1, text2 in pairs:
+            entities1, entities2 = entities[text1], entities[text2]
+            for field in set(entities1) | set(entities2):
+                val1 = entities1.get(field, "")
+                val2 = entities2.get(field, "")
+                if self.needs_embedding(val1, val2, field):
+                    pending.extend((val1, val2))
+        embeddings = self.encode_values(pending, batch_size=batch_size)
+        
+        return [
+            self.build_report(text1, text2, entities[text1], entities[text2], embeddings)
+            for text1, text2 in pairs
+        ]
+    
+    def build_report(self, text1: str, text2: str, entities1: Dict[str, str], entities2: Dict[str, str],
+                     embeddings: Optional[Dict] = None) -> Dict:
+        """Compare merged extractions field by field and assemble the report"""
         results = []
         all_fields = set(list(entities1.keys()) + list(entities2.keys()))
         
         for field in sorted(all_fields):
             val1 = entities1.get(field, "")
             val2 = entities2.get(field, "")
-            status, v1, v2, confidence = self.compare_field(val1, val2)
+            status, v1, v2, confidence = self.compare_field(val1, val2, embeddings, field=field)
             results.append([field, v1, v2, status, confidence])
         
         # Calculate overall similarity
@@ -244,8 +688,8 @@ Return only the JSON object, no other text.
             "product1": text1,
             "product2": text2,
             "extractions": {
-                "product1": entities1,
-                "product2": entities2
+                "product1": dict(entities1),
+                "product2": dict(entities2)
             },
             "comparison": results,
             "overall_similarity": avg_confidence,
@@ -256,34 +700,12 @@ Return only the JSON object, no other text.
         return report
     
     def print_report(self, report: Dict):
-        """Print a formatted comparison report"""
-        print("\n" + "="*80)
-        print("📋 ENHANCED PRODUCT COMPARISON REPORT")
-        print("="*80)
-        
-        print(f"\n📊 Overall Similarity: {report['overall_similarity']:.2f}")
-        print(f"✅ Matching Fields: {report['matching_fields']}/{report['total_fields']}")
-        
-        # Create comparison table
-        table = PrettyTable()
-        table.field_names = ["Field", "Product 1", "Product 2", "Status", "Confidence"]
-        table.align = "l"
-        
-        for field, val1, val2, status, confidence in report["comparison"]:
-            table.add_row([
-                field.title(),
-                val1 or "-",
-                val2 or "-", 
-                status,
-                f"{confidence:.2f}"
-            ])
-        
-        print(table)
-        
-        # Show extraction details
-        print(f"\n📝 Extraction Details:")
-        print(f"Product 1: {json.dumps(report['extractions']['product1'], indent=2)}")
-        print(f"Product 2: {json.dumps(report['extractions']['product2'], indent=2)}")
+        """Hand a comparison report to the reporter's sink (a PrettyTable on stdout by default)"""
+        self.reporter.report(report)
+    
+    def set_output(self, level=None, sink=None, stream: Optional[TextIO] = None) -> Reporter:
+        """Change the log level ("quiet", "warning", "info", "debug"), report sink or log stream"""
+        return self.reporter.configure(level=level, sink=sink, stream=stream)
 
 def main():
     """Main function for testing the enhanced comparator"""
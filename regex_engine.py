@@ -0,0 +1,85 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import re._parser as sre_parse
+    from re._constants import LITERAL, SUBPATTERN
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import LITERAL, SUBPATTERN
+
+# ---
+# REGEX EXTRACTION ENGINE
+# Compiles every field pattern once and skips patterns whose required
+# literal text is absent, while reproducing per-pattern re.finditer results
+# ---
+
+def required_literal(pattern: str) -> Optional[str]:
+    """Longest literal run every match of `pattern` must contain (lowercased), if any
+
+    Only literals in the pattern's top-level sequence (or in plain groups within
+    it) are considered, so the result is always safe to use as a prefilter.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+
+    runs, current = [], []
+
+    def walk(items):
+        for op, av in items:
+            if op == LITERAL:
+                current.append(chr(av))
+            elif op == SUBPATTERN:
+                walk(av[-1])
+            else:
+                runs.append("".join(current))
+                current.clear()
+
+    walk(parsed)
+    runs.append("".join(current))
+    longest = max(runs, key=len)
+    return longest.lower() or None
+
+
+class RegexExtractionEngine:
+    """Precompiled scanner over a {field: [pattern, ...]} table
+
+    Each pattern is compiled once at construction. Per text, one lowercased copy
+    is checked for each pattern's required literal ("mm", "is", "astm", ...) and
+    only patterns that can possibly match are run.
+
+    A single combined lookahead scanner (one named group per pattern) was measured
+    against this on the training corpus and was over twice as slow under CPython's
+    backtracking `re`, because the overlapping digit patterns match at almost every
+    digit position. Per-pattern finditer with literal prefilters is faster and
+    returns exactly the same matches.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]], flags: int = re.IGNORECASE):
+        self.fields = list(patterns)
+        self.rules: List[Tuple[str, Optional[str], callable]] = [
+            (field, required_literal(pattern), re.compile(pattern, flags).finditer)
+            for field, field_patterns in patterns.items()
+            for pattern in field_patterns
+        ]
+
+    def extract(self, text: str) -> Dict[str, List[Tuple[str, float]]]:
+        """Extract (value, confidence) candidates per field
+
+        Values are lowercased to match the previous behaviour of scanning a
+        lowercased copy of the text.
+        """
+        entities = {field: [] for field in self.fields}
+        text_lower = text.lower()
+        for field, literal, finditer in self.rules:
+            if literal is not None and literal not in text_lower:
+                continue
+            values = entities[field]
+            for match in finditer(text_lower):
+                value = match.group()
+                # Higher confidence for longer matches
+                confidence = 0.4 + (len(value) / 10)
+                values.append((value, confidence if confidence < 0.8 else 0.8))
+        return entities
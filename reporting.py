@@ -0,0 +1,149 @@
+import contextlib
+import json
+import os
+import sys
+from typing import Dict, Optional, TextIO
+
+# ---
+# REPORTING
+# Log levels and pluggable report sinks for the comparator. Progress lines are
+# only formatted when the reporter's level asks for them, and reports are
+# only rendered when the sink does something with them, so a QUIET reporter
+# with a NullSink does no console or formatting work at all.
+# ---
+
+QUIET = 0
+WARNING = 1
+INFO = 2
+DEBUG = 3
+
+LEVELS = {"quiet": QUIET, "warning": WARNING, "info": INFO, "debug": DEBUG}
+
+
+def _stream(stream: Optional[TextIO]) -> TextIO:
+    # Resolved per write so contextlib.redirect_stdout keeps working
+    return stream if stream is not None else sys.stdout
+
+
+@contextlib.contextmanager
+def logs_silenced(quiet: bool):
+    """Send print() output (e.g. model-loading messages) to devnull while `quiet`"""
+    if not quiet:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class NullSink:
+    """Drops reports without rendering them"""
+
+    def emit(self, report: Dict):
+        pass
+
+    def close(self):
+        pass
+
+
+class JSONLSink:
+    """One compact JSON object per report"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def emit(self, report: Dict):
+        out = _stream(self.stream)
+        out.write(json.dumps(report, ensure_ascii=False, default=float) + "\n")
+
+    def close(self):
+        _stream(self.stream).flush()
+
+
+class TableSink:
+    """The human-readable PrettyTable report (the comparator's default)"""
+
+    def __init__(self, stream: Optional[TextIO] = None, show_extractions: bool = True):
+        self.stream = stream
+        self.show_extractions = show_extractions
+
+    def emit(self, report: Dict):
+        from prettytable import PrettyTable
+
+        out = _stream(self.stream)
+        print("\n" + "="*80, file=out)
+        print("📋 ENHANCED PRODUCT COMPARISON REPORT", file=out)
+        print("="*80, file=out)
+
+        print(f"\n📊 Overall Similarity: {report['overall_similarity']:.2f}", file=out)
+        print(f"✅ Matching Fields: {report['matching_fields']}/{report['total_fields']}", file=out)
+
+        # Create comparison table
+        table = PrettyTable()
+        table.field_names = ["Field", "Product 1", "Product 2", "Status", "Confidence"]
+        table.align = "l"
+
+        for field, val1, val2, status, confidence in report["comparison"]:
+            table.add_row([
+                field.title(),
+                val1 or "-",
+                val2 or "-",
+                status,
+                f"{confidence:.2f}"
+            ])
+
+        print(table, file=out)
+
+        # Show extraction details
+        if self.show_extractions:
+            print("\n📝 Extraction Details:", file=out)
+            print(f"Product 1: {json.dumps(report['extractions']['product1'], indent=2)}", file=out)
+            print(f"Product 2: {json.dumps(report['extractions']['product2'], indent=2)}", file=out)
+
+    def close(self):
+        _stream(self.stream).flush()
+
+
+class Reporter:
+    """Level-filtered progress lines plus a report sink
+
+    Callers guard expensive messages with `enabled(level)` so nothing is
+    formatted below the configured level.
+    """
+
+    def __init__(self, level: int = INFO, sink=None, stream: Optional[TextIO] = None):
+        self.level = INFO
+        self.sink = TableSink()
+        self.stream = None
+        self.configure(level=level, sink=sink, stream=stream)
+
+    def configure(self, level=None, sink=None, stream: Optional[TextIO] = None) -> "Reporter":
+        """Update only the settings given; `level` may be a name from LEVELS"""
+        if level is not None:
+            self.level = LEVELS[level] if isinstance(level, str) else level
+        if sink is not None:
+            self.sink = sink
+        if stream is not None:
+            self.stream = stream
+        return self
+
+    def enabled(self, level: int) -> bool:
+        return level <= self.level
+
+    def log(self, level: int, message: str):
+        if level <= self.level:
+            print(message, file=_stream(self.stream))
+
+    def warning(self, message: str):
+        self.log(WARNING, message)
+
+    def info(self, message: str):
+        self.log(INFO, message)
+
+    def debug(self, message: str):
+        self.log(DEBUG, message)
+
+    def report(self, report: Dict):
+        self.sink.emit(report)
+
+    def close(self):
+        self.sink.close()
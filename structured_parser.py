@@ -0,0 +1,102 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# ---
+# STRUCTURED DESCRIPTIONS
+# Fast path for catalog records written as "KEY :- value; KEY :- value; ...",
+# e.g. "GRADE:- FE550D; FORM :- Straight bars; STANDARD :- IS 1786". Each
+# record is split once on ";" and ":-", keys are mapped to the comparator's
+# fields, and the result is used as-is, without NER, regex or the LLM
+# ---
+
+# Record keys (uppercased, single-spaced) for each comparator field
+FIELD_KEYS = {
+    "Material": ["MATERIAL", "PRODUCT"],
+    "Grade": ["GRADE"],
+    "Diameter": ["DIAMETER", "DIA", "NOMINAL DIAMETER", "NOMINAL DIAMETER OF STRAND", "SIZE"],
+    "Length": ["LENGTH", "LEN"],
+    "Form": ["FORM"],
+    "Standard": ["STANDARD", "SPECIFICATION", "SPEC"],
+}
+
+# Fields an unkeyed segment ("ORDINARY PORTLAND CEMENT;", "1860;") may fill,
+# in order, when the alias tables know the whole segment
+UNKEYED_FIELDS = ("Material", "Grade", "Form", "Standard")
+
+_SEGMENT = re.compile(r"\s*;\s*")
+_KEY_VALUE = re.compile(r"^([A-Za-z][A-Za-z _]*?)\s*:-\s*(.*)$")
+_SPACES = re.compile(r"[\s_]+")
+
+
+class StructuredParser:
+    """Split "KEY :- value;" records into {field: value}; free text is left to the full pipeline"""
+
+    def __init__(self, canonicalizer=None, field_keys: Optional[Dict[str, List[str]]] = None,
+                 min_keyed_fields: int = 2):
+        # Optional canonical.Canonicalizer, used to place unkeyed segments
+        self.canonicalizer = canonicalizer
+        self.keys = {
+            key: field for field, keys in (field_keys or FIELD_KEYS).items() for key in keys
+        }
+        # A description is structured when at least this many "KEY :- value" segments map to a field
+        self.min_keyed_fields = min_keyed_fields
+
+        # Counters
+        self.parsed = 0
+        self.skipped = 0
+
+    @staticmethod
+    def split(text: str) -> List[Tuple[Optional[str], str]]:
+        """(KEY, value) per non-empty ";" segment; KEY is None for segments without ":-\""""
+        segments = []
+        for segment in _SEGMENT.split(text.strip()):
+            if not segment:
+                continue
+            match = _KEY_VALUE.match(segment)
+            if match:
+                key = _SPACES.sub(" ", match.group(1)).strip().upper()
+                segments.append((key, match.group(2).strip()))
+            else:
+                segments.append((None, segment))
+        return segments
+
+    def parse(self, text: str) -> Optional[Dict[str, str]]:
+        """Field values of a structured description, or None if `text` is not structured"""
+        if ":-" not in text:
+            self.skipped += 1
+            return None
+        segments = self.split(text)
+        entities: Dict[str, str] = {}
+        unkeyed = []
+        for key, value in segments:
+            if key is None:
+                unkeyed.append(value)
+                continue
+            field = self.keys.get(key)
+            if field is not None and value:
+                # The first occurrence of a field wins, as in the regex rules
+                entities.setdefault(field, value)
+        # Keys that map to no field ("TYPE :- P") do not make free text structured
+        if len(entities) < self.min_keyed_fields:
+            self.skipped += 1
+            return None
+
+        if self.canonicalizer is not None:
+            for value in unkeyed:
+                for field in UNKEYED_FIELDS:
+                    if field in entities or not self.canonicalizer.handles(field):
+                        continue
+                    canonical = self.canonicalizer.canonicalize(field, value)
+                    if canonical is not None and canonical in self.canonicalizer.fields[field.lower()].canonicals:
+                        entities[field] = value
+                        break
+        self.parsed += 1
+        return entities
+
+    def stats(self) -> Dict:
+        total = self.parsed + self.skipped
+        return {
+            "parsed": self.parsed,
+            "skipped": self.skipped,
+            "structured_rate": self.parsed / total if total else 0.0,
+        }
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for MicroBatchScheduler backpressure and shutdown (batch_scheduler.py)
+"""
+
+import sys
+import threading
+import time
+sys.path.append(".")
+
+from batch_scheduler import MicroBatchScheduler, SchedulerClosed, SchedulerFull
+from test_doubles import offline_comparator
+
+
+def _wait_until(condition, timeout: float = 2.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_backpressure():
+    """A full queue rejects new groups with SchedulerFull instead of growing"""
+    print("🧪 Testing queue backpressure...")
+    release = threading.Event()
+    scheduler = MicroBatchScheduler(lambda items: release.wait() and items, max_latency_ms=0, max_queue=1)
+    try:
+        running = scheduler.submit_many(["a"])
+        _wait_until(lambda: scheduler.pending() == 0)  # the worker holds "a"
+        queued = scheduler.submit_many(["b"])
+        try:
+            scheduler.submit_many(["c"])
+            raise AssertionError("expected SchedulerFull")
+        except SchedulerFull:
+            pass
+        assert scheduler.rejected == 1
+        release.set()
+        assert running.result(timeout=2) == ["a"] and queued.result(timeout=2) == ["b"]
+    finally:
+        release.set()
+        scheduler.close()
+    print("✅ Third group rejected, queued groups still served")
+    return True
+
+
+def test_close_drains_then_rejects():
+    """close() processes what was queued; later submits fail with SchedulerClosed"""
+    print("\n🧪 Testing close()...")
+    scheduler = MicroBatchScheduler(lambda items: [item * 2 for item in items], max_latency_ms=50)
+    futures = [scheduler.submit(n) for n in range(5)]
+    scheduler.close()
+    assert [future.result(timeout=0) for future in futures] == [0, 2, 4, 6, 8]
+    try:
+        scheduler.submit(1)
+        raise AssertionError("expected SchedulerClosed")
+    except SchedulerClosed as e:
+        assert isinstance(e, RuntimeError)
+    print("✅ Queued items processed, new ones rejected")
+    return True
+
+
+def test_comparator_falls_back_to_direct_encode():
+    """A full or closed encode scheduler is not turned into a 0.0 similarity"""
+    print("\n🧪 Testing encode fallback in semantic_similarity...")
+    comparator = offline_comparator()
+    closed = MicroBatchScheduler(comparator.semantic_model.encode)
+    closed.close()
+    comparator.encode_scheduler = closed
+    assert abs(comparator.semantic_similarity("Straight bars", "Straight bars") - 1.0) < 1e-6
+
+    release = threading.Event()
+    full = MicroBatchScheduler(lambda items: release.wait() and items, max_latency_ms=0, max_queue=1)
+    try:
+        full.submit_many(["held"])
+        _wait_until(lambda: full.pending() == 0)
+        full.submit_many(["queued"])
+        comparator.encode_scheduler = full
+        assert abs(comparator.semantic_similarity("Coil", "Coil") - 1.0) < 1e-6
+    finally:
+        release.set()
+        full.close()
+    print("✅ Values are encoded directly when the scheduler cannot take them")
+    return True
+
+
+def main():
+    tests = [
+        test_backpressure,
+        test_close_drains_then_rejects,
+        test_comparator_falls_back_to_direct_encode,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Regression tests for canonical alias matching in compare_field
+"""
+
+import sys
+sys.path.append(".")
+
+from canonical import Canonicalizer
+from product_comparator_enhanced import EnhancedProductComparator
+
+
+def _comparator():
+    # Canonical verdicts are decided before the fuzzy/semantic tiers, so no model is loaded
+    comparator = EnhancedProductComparator(model_path="ner_model_improved")
+    comparator.set_output("quiet")
+    return comparator
+
+
+def test_distinct_grades_mismatch():
+    """Fe500 vs Fe500D was a Fuzzy Match before the alias tables; it is now a hard mismatch"""
+    print("🧪 Testing Fe500 vs Fe500D...")
+    comparator = _comparator()
+    for field in ("Grade", "grade"):
+        status, _, _, confidence = comparator.compare_field("Fe500", "Fe500D", field=field)
+        assert (status, confidence) == ("❌ Mismatch", 0.0), (field, status)
+    assert comparator.cascade_stats()["tiers"]["canonical"]["hits"] == 2
+    print("✅ Fe500 vs Fe500D is a canonical mismatch")
+    return True
+
+
+def test_distinct_cement_grades_mismatch():
+    """OPC 43 vs OPC 53 was a Semantic Match before the alias tables; it is now a hard mismatch"""
+    print("\n🧪 Testing OPC 43 vs OPC 53...")
+    comparator = _comparator()
+    for val1, val2 in (("OPC 43", "OPC 53"), ("opc 43", "opc 53")):
+        status, _, _, confidence = comparator.compare_field(val1, val2, field="grade")
+        assert (status, confidence) == ("❌ Mismatch", 0.0), (val1, val2, status)
+    assert comparator.cascade_stats()["tiers"]["semantic"]["calls"] == 0
+    print("✅ OPC 43 vs OPC 53 is a canonical mismatch")
+    return True
+
+
+def test_aliases_still_match():
+    """Spellings of the same grade keep matching"""
+    print("\n🧪 Testing grade aliases...")
+    canonicalizer = Canonicalizer()
+    assert canonicalizer.compare("Grade", "Fe 500D", "FE500D") is True
+    assert _comparator().compare_field("Fe 500D", "fe_500d", field="grade")[0] == "✅ Canonical Match"
+    print("✅ Aliases of one grade match")
+    return True
+
+
+def test_form_synonyms_match():
+    """Bulk is Loose and Packed is Bag, as in product-comparator's vocabulary"""
+    print("\n🧪 Testing form synonyms...")
+    canonicalizer = Canonicalizer()
+    assert canonicalizer.compare("Form", "Bulk", "Loose") is True
+    assert canonicalizer.compare("Form", "Packed", "Bags") is True
+    assert canonicalizer.compare("Form", "Loose", "Bag") is False
+    assert _comparator().compare_field("bulk", "Loose", field="Form")[0] == "✅ Canonical Match"
+    print("✅ Bulk/Loose and Packed/Bag match, Loose/Bag does not")
+    return True
+
+
+def main():
+    tests = [
+        test_distinct_grades_mismatch,
+        test_distinct_cement_grades_mismatch,
+        test_aliases_still_match,
+        test_form_synonyms_match,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental catalog index updates (upsert / sync / compact)
+"""
+
+import contextlib
+import hashlib
+import io
+import sys
+
+import numpy as np
+
+sys.path.append(".")
+
+from catalog_index import CatalogIndex
+from reporting import Reporter
+
+
+class _HashModel:
+    """Deterministic text vectors, so the tests need no SentenceTransformer download"""
+
+    def encode(self, texts, batch_size=64):
+        rows = []
+        for text in texts:
+            seed = int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+            rows.append(np.random.RandomState(seed).rand(16))
+        return np.asarray(rows, dtype=np.float32)
+
+
+class _Comparator:
+    """Just the comparator surface CatalogIndex uses; extraction finds fields but no embeddings"""
+
+    def __init__(self):
+        self.semantic_model = _HashModel()
+        self.reporter = Reporter(level="quiet")
+        self.extracted = 0
+
+    def extract_many(self, texts, batch_size=64):
+        self.extracted += len(texts)
+        return {text: {"Material": text.split()[0]} for text in texts}
+
+    def encode_values(self, values, batch_size=64):
+        return {}
+
+
+def test_upsert_then_compact_without_field_embeddings():
+    """Rows upserted into an index built with fields but no field embeddings keep their entities"""
+    print("🧪 Testing upsert + compact on an index without field embeddings...")
+    comparator = _Comparator()
+    index = CatalogIndex(comparator, index_type="flat", compact_ratio=1.0)
+    index.build(["a", "b", "c"], ["TMT Fe500 12mm", "OPC 53 Bag", "PC Strand 15.2mm"])
+    assert index.field_vectors == {} and len(index.entities) == 3
+
+    counts = index.upsert(["b", "d"], ["OPC 43 Bag", "TMT Fe550D 16mm"])
+    assert counts == {"added": 1, "changed": 1, "unchanged": 0}, counts
+    assert len(index.entities) == len(index.ids) == 5
+    assert comparator.extracted == 5  # only the two new rows were extracted
+
+    index.compact()
+    assert index.ids == ["a", "c", "b", "d"]
+    assert [entities["Material"] for entities in index.entities] == ["TMT", "PC", "OPC", "TMT"]
+    assert index.search("OPC 43 Bag", k=1)[0][0] == "b"
+    print("✅ Entities stay aligned with rows through upsert and compact")
+    return True
+
+
+def test_tombstones_are_not_returned():
+    """Deleted and replaced rows never come back from a search"""
+    print("\n🧪 Testing tombstone filtering...")
+    index = CatalogIndex(_Comparator(), index_type="flat", compact_ratio=1.0)
+    index.build(["a", "b", "c"], ["TMT Fe500 12mm", "OPC 53 Bag", "PC Strand 15.2mm"])
+    index.sync(["a", "c"], ["TMT Fe500 12mm", "PC Strand 12.7mm"])
+    found = {catalog_id for catalog_id, _ in index.search("PC Strand 15.2mm", k=10)}
+    assert found == {"a", "c"}, found
+    assert index.live_rows() == 2 and len(index.deleted) == 2
+    print("✅ Only live rows are searched")
+    return True
+
+
+def test_duplicate_ids_rejected():
+    """build, upsert, sync and delete refuse repeated catalog ids"""
+    print("\n🧪 Testing duplicate id checks...")
+    index = CatalogIndex(_Comparator(), index_type="flat")
+    for call in (
+        lambda: index.build(["a", "a"], ["TMT", "OPC"]),
+        lambda: index.upsert(["x", "x"], ["TMT", "OPC"]),
+        lambda: index.sync(["x", "x"], ["TMT", "OPC"]),
+        lambda: index.delete(["x", "x"]),
+    ):
+        try:
+            call()
+        except ValueError:
+            continue
+        raise AssertionError("repeated ids were accepted")
+    print("✅ Repeated ids raise ValueError")
+    return True
+
+
+def test_quiet_reporter_silences_progress():
+    """Progress lines go through comparator.reporter"""
+    print("\n🧪 Testing progress output...")
+    index = CatalogIndex(_Comparator(), index_type="flat", compact_ratio=0.0)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        index.build(["a", "b"], ["TMT Fe500 12mm", "OPC 53 Bag"])
+        index.sync(["a"], ["TMT Fe500 12mm"])
+    assert out.getvalue() == "", out.getvalue()
+    print("✅ A quiet reporter prints nothing")
+    return True
+
+
+def main():
+    tests = [
+        test_upsert_then_compact_without_field_embeddings,
+        test_tombstones_are_not_returned,
+        test_duplicate_ids_rejected,
+        test_quiet_reporter_silences_progress,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
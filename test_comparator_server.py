@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for Content-Length handling in comparator_server.py (raw sockets, no models)
+"""
+
+import re
+import socket
+import sys
+import threading
+sys.path.append(".")
+
+from comparator_server import make_server
+from test_doubles import offline_comparator
+
+HEALTH = b"GET /health HTTP/1.1\r\nHost: test\r\n\r\n"
+
+
+def _serve():
+    server = make_server(offline_comparator(), port=0, max_wait_ms=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _stop(server):
+    server.shutdown()
+    server.scheduler.close()
+    server.server_close()
+
+
+def _exchange(server, data: bytes) -> str:
+    """Send `data` on one connection and read until the server closes it (or goes quiet)"""
+    conn = socket.create_connection(server.server_address, timeout=2)
+    conn.sendall(data)
+    received = b""
+    try:
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+    except socket.timeout:
+        pass
+    finally:
+        conn.close()
+    return received.decode("utf-8", "replace")
+
+
+def _statuses(response: str):
+    # Responses follow each other directly, after a body with no trailing newline
+    return re.findall(r"HTTP/1\.1 (\d{3}) ", response)
+
+
+def test_invalid_length_closes_connection():
+    """A 400 sent before the body is read closes the connection, so the body is not parsed as a request"""
+    print("🧪 Testing invalid Content-Length values...")
+    server = _serve()
+    try:
+        for length in ("-1", "abc", "1e3", "99999999999"):
+            request = f"POST /compare HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode()
+            response = _exchange(server, request + HEALTH)
+            assert _statuses(response) == ["400"], (length, response)
+            assert "Connection: close" in response, response
+    finally:
+        _stop(server)
+    print("✅ 400 and the smuggled GET /health is never answered")
+    return True
+
+
+def test_unknown_path_closes_connection():
+    """A POST to an unknown path does not read its body either"""
+    print("\n🧪 Testing POST to an unknown path...")
+    server = _serve()
+    try:
+        body = HEALTH
+        request = f"POST /nope HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        response = _exchange(server, request + body)
+        assert _statuses(response) == ["404"], response
+    finally:
+        _stop(server)
+    print("✅ 404 closes the connection")
+    return True
+
+
+def test_drained_errors_keep_alive():
+    """Errors after the whole body was read leave the connection usable"""
+    print("\n🧪 Testing keep-alive after a 400 on a read body...")
+    server = _serve()
+    try:
+        request = b"POST /compare HTTP/1.1\r\nHost: test\r\nContent-Length: 3\r\n\r\nabc"
+        conn = socket.create_connection(server.server_address, timeout=2)
+        conn.sendall(request + HEALTH)
+        received = b""
+        while received.count(b"HTTP/1.1 ") < 2 or not received.endswith(b"}"):
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            received += chunk
+        conn.close()
+        assert _statuses(received.decode()) == ["400", "200"], received
+    finally:
+        _stop(server)
+    print("✅ Invalid JSON is a 400 and the next request is still served")
+    return True
+
+
+def main():
+    tests = [
+        test_invalid_length_closes_connection,
+        test_unknown_path_closes_connection,
+        test_drained_errors_keep_alive,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
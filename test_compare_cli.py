@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for input format detection in the batch CLI (compare_cli.py)
+"""
+
+import codecs
+import io
+import os
+import sys
+import tempfile
+sys.path.append(".")
+
+from compare_cli import DEFAULT_COLUMNS, detect_format, open_input, read_csv, read_jsonl
+
+JSONL = b'{"product1": "TMT Fe500D 12mm", "product2": "TMT Fe 500D 12 mm", "id": "a"}\n'
+CSV = b"id,product1,product2\na,TMT Fe500D 12mm,TMT Fe 500D 12 mm\n"
+
+
+def _stdin(data: bytes) -> io.TextIOWrapper:
+    """A stand-in for sys.stdin as open_input wraps it (peekable buffer, BOM-dropping decoder)"""
+    return io.TextIOWrapper(io.BufferedReader(io.BytesIO(data)), encoding="utf-8-sig", newline="")
+
+
+def test_stdin_detection():
+    """JSONL on stdin is found past a byte order mark and leading blank lines"""
+    print("🧪 Testing format detection on stdin...")
+    cases = {
+        JSONL: "jsonl",
+        b"\n\n  " + JSONL: "jsonl",
+        codecs.BOM_UTF8 + JSONL: "jsonl",
+        codecs.BOM_UTF8 + b"\r\n\t" + JSONL: "jsonl",
+        CSV: "csv",
+        codecs.BOM_UTF8 + CSV: "csv",
+        b"": "csv",
+    }
+    for data, expected in cases.items():
+        assert detect_format("-", _stdin(data)) == expected, (data, expected)
+    print("✅ BOM and whitespace are skipped")
+    return True
+
+
+def test_detection_does_not_consume_input():
+    """Peeking leaves every row for the reader, without the BOM"""
+    print("\n🧪 Testing rows after detection...")
+    stream = _stdin(codecs.BOM_UTF8 + b"\n" + JSONL)
+    assert detect_format("-", stream) == "jsonl"
+    assert [row[1:] for row in read_jsonl(stream, DEFAULT_COLUMNS, "id")] == [
+        ("TMT Fe500D 12mm", "TMT Fe 500D 12 mm", "a"),
+    ]
+    stream = _stdin(codecs.BOM_UTF8 + CSV)
+    assert detect_format("-", stream) == "csv"
+    assert [row[1:] for row in read_csv(stream, DEFAULT_COLUMNS, "id")] == [
+        ("TMT Fe500D 12mm", "TMT Fe 500D 12 mm", "a"),
+    ]
+    print("✅ First row read intact")
+    return True
+
+
+def test_files_by_extension():
+    """Files are detected by extension and opened without their BOM"""
+    print("\n🧪 Testing files with a byte order mark...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pairs.csv")
+        with open(path, "wb") as f:
+            f.write(codecs.BOM_UTF8 + CSV)
+        with open_input(path, "utf-8") as stream:
+            assert detect_format(path, stream) == "csv"
+            assert next(read_csv(stream, DEFAULT_COLUMNS, "id"))[3] == "a"
+    assert detect_format("pairs.ndjson", _stdin(CSV)) == "jsonl"
+    assert detect_format("pairs.tsv", _stdin(JSONL)) == "tsv"
+    print("✅ Extension wins and the id column is found")
+    return True
+
+
+def main():
+    tests = [
+        test_stdin_detection,
+        test_detection_does_not_consume_input,
+        test_files_by_extension,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized catalog deduplication (dedup.py)
+"""
+
+import itertools
+import sys
+sys.path.append(".")
+
+from dedup import CatalogDeduplicator, FieldColumn
+from test_doubles import offline_comparator
+
+
+def _assert_matches_compare_field(comparator, field, values, block_size=2048):
+    column = FieldColumn(field, values)
+    column.score_values(comparator, block_size=block_size)
+    for a, b in itertools.product(range(len(column.values)), repeat=2):
+        val1, val2 = column.values[a], column.values[b]
+        expected = comparator.compare_field(val1, val2, field=field)[3]
+        assert abs(column.scores[a, b] - expected) < 1e-5, (field, val1, val2, column.scores[a, b], expected)
+
+
+def test_unparseable_numeric_value():
+    """A Diameter that is not a plain length goes to the string tiers instead of crashing"""
+    print("🧪 Testing numeric column with an unparseable value...")
+    comparator = offline_comparator()
+    values = ["12mm", "12 mm", "12 MM DIA", "1.2 cm", "16mm", "approx 12"]
+    _assert_matches_compare_field(comparator, "diameter", values)
+    column = FieldColumn("Diameter", values)
+    column.score_values(comparator)
+    assert column.scores[0, 3] == 1.0  # 12mm == 1.2 cm
+    print("✅ Scores match compare_field, odd values included")
+    return True
+
+
+def test_blocks_match_full_matrix():
+    """Scoring in small row blocks gives the same table as compare_field"""
+    print("\n🧪 Testing block-wise fuzzy/semantic scoring...")
+    comparator = offline_comparator()
+    values = ["Fe500D", "Fe 500D", "FE500", "Fe550D", "Fe-500D", "Straight bars", "Straight bar", "Coil"]
+    _assert_matches_compare_field(comparator, "Grade", values, block_size=3)
+    _assert_matches_compare_field(comparator, "Form", values, block_size=1)
+    print("✅ Block size does not change any score")
+    return True
+
+
+def test_settled_blocks_skip_encoding():
+    """A column decided by the canonical and fuzzy stages never calls the semantic model"""
+    print("\n🧪 Testing that settled blocks are not encoded...")
+    comparator = offline_comparator()
+    calls = []
+    encode_values = comparator.encode_values
+    comparator.encode_values = lambda values: calls.append(list(values)) or encode_values(values)
+    column = FieldColumn("Grade", ["Fe500D", "Fe 500D", "Fe550D", "FE-550D"])
+    column.score_values(comparator, block_size=2)
+    assert calls == [], calls
+    print("✅ No embeddings computed for a fully settled column")
+    return True
+
+
+def test_duplicate_pairs_match_brute_force():
+    """candidate_pairs finds exactly the pairs whose every field matches in build_report"""
+    print("\n🧪 Testing duplicate pairs against pairwise reports...")
+    comparator = offline_comparator()
+    records = [
+        {"grade": "Fe500D", "diameter": "12mm", "Material": "TMT"},
+        {"grade": "Fe 500D", "diameter": "12 mm", "Material": "TMT"},
+        {"grade": "Fe500D", "diameter": "1.2 cm", "Material": "TMT"},
+        {"grade": "Fe550D", "diameter": "12mm", "Material": "TMT"},
+        {"grade": "Fe500D", "diameter": "12 MM DIA", "Material": "TMT"},
+        {"grade": "Fe500D", "Material": "TMT"},
+    ]
+    deduplicator = CatalogDeduplicator(comparator, row_block_size=2)
+    columns = deduplicator.build_columns(records)
+    found = {(i, j) for i, j, _ in deduplicator.candidate_pairs(columns, len(records))}
+
+    expected = set()
+    for i, j in itertools.combinations(range(len(records)), 2):
+        report = comparator.build_report(str(i), str(j), records[i], records[j])
+        if all("Match" in row[3] for row in report["comparison"]):
+            expected.add((i, j))
+    assert found == expected, (found, expected)
+    assert (0, 1) in found and (0, 2) in found and (0, 3) not in found and (0, 5) not in found
+    print(f"✅ {len(found)} duplicate pairs, same as pairwise comparison")
+    return True
+
+
+def main():
+    tests = [
+        test_unparseable_numeric_value,
+        test_blocks_match_full_matrix,
+        test_settled_blocks_skip_encoding,
+        test_duplicate_pairs_match_brute_force,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,34 @@
+"""
+Offline stand-ins shared by the test scripts (no model downloads)
+"""
+
+import hashlib
+
+import numpy as np
+
+
+class HashModel:
+    """SentenceTransformer stand-in: a fixed pseudo-random vector per text
+
+    Equal texts get equal vectors; different texts are close to orthogonal,
+    so they only ever match through the exact, canonical, numeric or fuzzy tiers.
+    """
+
+    dim = 32
+
+    def encode(self, texts, batch_size=64, **kwargs):
+        rows = []
+        for text in texts:
+            seed = int(hashlib.sha1(str(text).encode("utf-8")).hexdigest()[:8], 16)
+            rows.append(np.random.RandomState(seed).randn(self.dim))
+        return np.asarray(rows, dtype=np.float32)
+
+
+def offline_comparator(**kwargs):
+    """A quiet EnhancedProductComparator whose semantic model is a HashModel"""
+    from product_comparator_enhanced import EnhancedProductComparator
+
+    comparator = EnhancedProductComparator(**kwargs)
+    comparator.set_output("quiet")
+    comparator.semantic_model = HashModel()
+    return comparator
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the compare_field tier cascade (field_cascade.py)
+"""
+
+import sys
+sys.path.append(".")
+
+from field_cascade import FieldCascade, Tier
+from test_doubles import offline_comparator
+
+
+class CountingTier(Tier):
+    """Records every pair it sees and decides only pairs listed in `answers`"""
+
+    def __init__(self, name, answers=None):
+        self.name = name
+        self.answers = answers or {}
+        self.seen = []
+
+    def decide(self, val1, val2, field, embeddings):
+        self.seen.append((val1, val2))
+        return self.answers.get((val1, val2))
+
+
+def test_default_order():
+    """exact -> canonical -> numeric -> fuzzy -> semantic, and the first tier that decides wins"""
+    print("🧪 Testing the default tier order...")
+    comparator = offline_comparator()
+    assert comparator.cascade.names() == ["exact", "canonical", "numeric", "fuzzy", "semantic"]
+    assert comparator.compare_field("Fe500D", "Fe500D", field="Grade")[0] == "✅ Exact Match"
+    assert comparator.compare_field("Fe 500D", "FE500D", field="Grade")[0] == "✅ Canonical Match"
+    assert comparator.compare_field("12mm", "1.2 cm", field="Diameter")[0] == "✅ Numeric Match"
+    assert comparator.compare_field("12mm", "16mm", field="Diameter")[0] == "❌ Mismatch"
+    tiers = comparator.cascade_stats()["tiers"]
+    # The canonical pair stopped before the numeric tier; the Diameter pairs passed canonical untouched
+    assert tiers["canonical"]["hits"] == 1 and tiers["numeric"]["calls"] == 2 and tiers["numeric"]["hits"] == 2
+    assert tiers["fuzzy"]["calls"] == 0 and tiers["semantic"]["calls"] == 0
+    print("✅ Tiers run cheapest first")
+    return True
+
+
+def test_reaches_then_compare_runs_each_tier_once():
+    """Tiers run by `reaches` are not run again by `compare`, but still show up in the stats"""
+    print("\n🧪 Testing the reaches/compare pending path...")
+    first = CountingTier("first")
+    second = CountingTier("second", {("a", "b"): ("✅ Second", "a", "b", 0.9)})
+    last = CountingTier("last")
+    cascade = FieldCascade([first, second, last])
+
+    assert cascade.reaches("last", "a", "b") is False  # decided by "second"
+    assert cascade.compare("a", "b") == ("✅ Second", "a", "b", 0.9)
+    assert (len(first.seen), len(second.seen), len(last.seen)) == (1, 1, 0)
+
+    assert cascade.reaches("last", "c", "d") is True
+    assert cascade.compare("c", "d")[0] == "❌ Mismatch"
+    assert (len(first.seen), len(second.seen), len(last.seen)) == (2, 2, 1)
+
+    stats = cascade.stats()
+    assert stats["tiers"]["first"]["calls"] == 2 and stats["tiers"]["second"]["hits"] == 1
+    assert stats["tiers"]["last"]["calls"] == 1 and stats["unresolved"] == 1
+    assert cascade.reaches("missing", "a", "b") is False
+    print("✅ Each tier ran once per pair and was counted once")
+    return True
+
+
+def test_tier_changes_drop_pending():
+    """Adding a tier forgets what `reaches` remembered, so positions stay valid"""
+    print("\n🧪 Testing pending results across add_tier...")
+    first = CountingTier("first")
+    last = CountingTier("last")
+    cascade = FieldCascade([first, last])
+    assert cascade.reaches("last", "a", "b") is True
+    cascade.add_tier(CountingTier("middle", {("a", "b"): ("✅ Middle", "a", "b", 1.0)}), before="last")
+    assert cascade.compare("a", "b")[0] == "✅ Middle"
+    assert len(first.seen) == 2 and not last.seen
+    print("✅ The pair went through the new cascade from the start")
+    return True
+
+
+def main():
+    tests = [
+        test_default_order,
+        test_reaches_then_compare_runs_each_tier_once,
+        test_tier_changes_drop_pending,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
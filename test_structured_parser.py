@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the "KEY :- value;" fast path (structured_parser.py)
+"""
+
+import sys
+sys.path.append(".")
+
+from canonical import Canonicalizer
+from structured_parser import StructuredParser
+from test_doubles import offline_comparator
+
+
+def test_keyed_segments():
+    """Keys map to fields, the first occurrence wins and unkeyed aliases are placed"""
+    print("🧪 Testing keyed and unkeyed segments...")
+    parser = StructuredParser(Canonicalizer())
+    entities = parser.parse(
+        "ORDINARY PORTLAND CEMENT; GRADE:- 53; FORM :- Loose; GRADE :- 43; STANDARD :- IS 269"
+    )
+    assert entities["Grade"] == "53", entities
+    assert entities["Form"] == "Loose" and entities["Standard"] == "IS 269", entities
+    assert entities["Material"] == "ORDINARY PORTLAND CEMENT", entities
+    assert parser.parse("NOMINAL DIAMETER OF STRAND :- 12.7 mm; GRADE :- 1860")["Diameter"] == "12.7 mm"
+    print("✅ Structured record parsed")
+    return True
+
+
+def test_unmapped_keys_are_free_text():
+    """Segments whose keys map to no field do not make a description structured"""
+    print("\n🧪 Testing free text with unmapped keys...")
+    comparator = offline_comparator()
+    text = "TMT FE500D 12mm IS 1786; TYPE :- P; CRS :- yes"
+    assert comparator.extract_structured(text) is None
+    assert comparator.extract_structured("GRADE :- FE500D; TYPE :- P") is None
+    assert comparator.structured_parser.stats()["parsed"] == 0
+    print("✅ Unmapped keys leave the text to the full pipeline")
+    return True
+
+
+def test_mixed_pair_lines_up():
+    """A structured record and free text for the same product match on every field"""
+    print("\n🧪 Testing a structured record against free text...")
+    comparator = offline_comparator()
+    structured = comparator.extract_structured(
+        "MATERIAL :- TMT; GRADE:- FE500D; DIAMETER :- 12 mm; FORM :- Straight bars; STANDARD :- IS 1786"
+    )
+    text = "TMT Fe500D 12mm IS 1786 Straight bars"
+    # NER reports Title-case keys, the regex stage lowercase ones
+    ner = {"Material": [("TMT", 0.85)], "Grade": [("Fe500D", 0.85)], "Form": [("Straight bars", 0.85)]}
+    free_text = comparator.merge_extractions(ner, comparator.extract_with_regex(text.lower()), {})
+    assert set(free_text) == set(structured), (free_text, structured)
+
+    report = comparator.build_report("structured", text, structured, free_text)
+    mismatches = [row for row in report["comparison"] if "Match" not in row[3]]
+    assert not mismatches, mismatches
+    assert report["total_fields"] == 5
+    print("✅ Every field matches, no duplicate grade/Grade rows")
+    return True
+
+
+def main():
+    tests = [
+        test_keyed_segments,
+        test_unmapped_keys_are_free_text,
+        test_mixed_pair_lines_up,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
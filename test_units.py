@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for unit-aware Diameter/Length parsing (units.py)
+"""
+
+import sys
+sys.path.append(".")
+
+from units import format_length, is_numeric_field, lengths_match, parse_length
+
+
+def test_parse_length():
+    """Plain numbers with an optional length unit become millimetres"""
+    print("🧪 Testing parse_length...")
+    cases = {
+        "12mm": 12.0, "12.00 mm": 12.0, "12 MM": 12.0, "1.2 cm": 12.0, ".5mm": 0.5,
+        "11.000mtr": 11000.0, "12 metres": 12000.0, "12 m": 12000.0, "12": 12.0, "15.20mm.": 15.2,
+    }
+    for value, expected in cases.items():
+        assert abs(parse_length(value) - expected) < 1e-9, (value, parse_length(value))
+    assert parse_length("12", default_unit="m") == 12000.0
+    print("✅ Units converted to millimetres")
+    return True
+
+
+def test_unparseable_values():
+    """Anything beyond a number and a unit is left to the string tiers"""
+    print("\n🧪 Testing values that are not plain lengths...")
+    for value in ("", None, "approx 12", "12 MM DIA", "12mm x 6m", "12 inch", "Fe500D"):
+        assert parse_length(value) is None, value
+    print("✅ Unparseable values return None")
+    return True
+
+
+def test_tolerance_and_fields():
+    """lengths_match uses abs_tol or rel_tol of the larger value; only Diameter/Length are numeric"""
+    print("\n🧪 Testing tolerances and numeric fields...")
+    assert lengths_match(12.0, 12.005) and not lengths_match(12.0, 12.05)
+    assert lengths_match(12000.0, 12010.0) and not lengths_match(12000.0, 12020.0)
+    assert lengths_match(12.0, 12.05, abs_tol=0.1)
+    assert is_numeric_field("Diameter") and is_numeric_field("length")
+    assert not is_numeric_field("Grade") and not is_numeric_field(None)
+    assert format_length(12.0) == "12 mm" and format_length(15.2) == "15.2 mm"
+    print("✅ Tolerances and field names behave as documented")
+    return True
+
+
+def main():
+    tests = [
+        test_parse_length,
+        test_unparseable_values,
+        test_tolerance_and_fields,
+    ]
+    passed = sum(1 for test in tests if test())
+    print("\n" + "="*50)
+    print(f"📊 Test Results: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,50 @@
+import math
+import re
+from typing import Optional
+
+# ---
+# UNITS
+# Parses Diameter/Length values such as "12mm", "12.00 mm", "11.000mtr" or
+# "12 metres" into floats in millimetres, so numeric fields are compared with
+# tolerance arithmetic instead of fuzzy/semantic string matching
+# ---
+
+NUMERIC_FIELDS = {"diameter", "length"}
+
+MM_PER_UNIT = {
+    "mm": 1.0, "millimeter": 1.0, "millimetre": 1.0,
+    "cm": 10.0, "centimeter": 10.0, "centimetre": 10.0,
+    "m": 1000.0, "mtr": 1000.0, "meter": 1000.0, "metre": 1000.0,
+}
+
+_MEASURE = re.compile(
+    r"^\s*(\d+(?:\.\d+)?|\.\d+)\s*"
+    r"(mm|millimet(?:er|re)s?|cm|centimet(?:er|re)s?|mtrs?|met(?:er|re)s?|m)?\.?\s*$",
+    re.IGNORECASE,
+)
+
+
+def is_numeric_field(field: Optional[str]) -> bool:
+    return bool(field) and field.lower() in NUMERIC_FIELDS
+
+
+def parse_length(value: str, default_unit: str = "mm") -> Optional[float]:
+    """Value in millimetres, or None if `value` is not a plain number with an optional length unit"""
+    if not value:
+        return None
+    match = _MEASURE.match(str(value))
+    if not match:
+        return None
+    unit = (match.group(2) or default_unit).lower()
+    unit = unit[:-1] if unit.endswith("s") and unit != "s" else unit
+    return float(match.group(1)) * MM_PER_UNIT[unit]
+
+
+def format_length(mm: float) -> str:
+    """Canonical display form: "12 mm", "15.2 mm", "12000 mm\""""
+    return f"{mm:.3f}".rstrip("0").rstrip(".") + " mm"
+
+
+def lengths_match(mm1: float, mm2: float, rel_tol: float = 1e-3, abs_tol: float = 0.01) -> bool:
+    """Equal within `abs_tol` mm or `rel_tol` of the larger value"""
+    return math.isclose(mm1, mm2, rel_tol=rel_tol, abs_tol=abs_tol)